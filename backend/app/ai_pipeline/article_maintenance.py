@@ -5,16 +5,16 @@ Manages article limits, cleanup, and topic lifecycle.
 FULLY ASYNC, TIMEZONE SAFE, AND MEMORY OPTIMIZED.
 """
 from app.config import MONGODB_URI, MONGODB_DB_NAME
+from app.ai_pipeline.topic_history import encode_embedding, decode_embedding
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from typing import List, Dict, Optional, Any
 from bson import ObjectId  
-import motor.motor_asyncio
+from pymongo import AsyncMongoClient, UpdateOne, UpdateMany
 import certifi
 import numpy as np
 import asyncio
 import logging
-import traceback
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -23,6 +23,10 @@ logger = logging.getLogger(__name__)
 # Timezone
 UK_TZ = ZoneInfo("Europe/London")
 
+# Fields rank_article reads; a trim never needs article content
+TRIM_ARTICLE_PROJECTION = {"ingested_at": 1, "source_priority": 1, "word_count": 1, "embedding": 1}
+TRIM_TOPIC_PROJECTION = {"article_ids": 1, "centroid_embedding": 1}
+
 class MaintenanceConfig:
     """All maintenance-related settings"""
     
@@ -39,6 +43,9 @@ class MaintenanceConfig:
     MIN_TOPIC_ARTICLES = 2          
     ARCHIVED_ARTICLE_PURGE_DAYS = 30 
     
+    # Topics trimmed per read/bulk_write round in trim_topics_bulk
+    TRIM_BATCH_SIZE = 50
+    
     # Shifted weights: Recency is prioritized. Similarity is lowered so breaking news is not punished.
     RANKING_WEIGHTS = {
         "recency": 0.50,
@@ -60,9 +67,10 @@ class MaintenanceConfig:
 
 
 class MaintenanceService:
-    def __init__(self, mongo_uri: str, db_name: str):
-        """Initialize with Motor async client"""
-        self.client = motor.motor_asyncio.AsyncIOMotorClient(
+    def __init__(self, mongo_uri: str, db_name: str, client: Optional[AsyncMongoClient] = None):
+        """Initialize with native async PyMongo client (reuses a shared client when one is passed in)"""
+        self._owns_client = client is None
+        self.client = client or AsyncMongoClient(
             mongo_uri, 
             tlsCAFile=certifi.where(),
             maxPoolSize=50,
@@ -121,8 +129,8 @@ class MaintenanceService:
 
         # 4. Similarity to centroid score (0-1)
         if article.get("embedding") and topic.get("centroid_embedding"):
-            article_emb = np.array(article["embedding"])
-            centroid_emb = np.array(topic["centroid_embedding"])
+            article_emb = np.array(article["embedding"], dtype=np.float32)
+            centroid_emb = decode_embedding(topic["centroid_embedding"])
             similarity = self.cosine_similarity(article_emb, centroid_emb)
             
             # BREAKING NEWS PROTECTION: 
@@ -135,6 +143,63 @@ class MaintenanceService:
         
         return score
     
+    def _plan_topic_trim(self, topic: Dict[str, Any], articles: List[Dict[str, Any]], now: datetime) -> Dict[str, Any]:
+        """
+        Rank a topic's articles and work out which to keep/detach.
+        Returns the write payloads without touching the database.
+        """
+        max_articles = self.config.MAX_ARTICLES_PER_TOPIC
+        seed_id = str(topic["article_ids"][0]) if topic.get("article_ids") else None
+        ranked_articles = []
+        
+        for article in articles:
+            score = self.rank_article(article, topic, now)
+            ranked_articles.append({
+                "article": article,
+                "score": score,
+                "is_seed": str(article["_id"]) == seed_id
+            })
+        
+        # Sort by score
+        ranked_articles.sort(key=lambda x: (x["is_seed"], x["score"]), reverse=True)
+        
+        to_keep = ranked_articles[:max_articles]
+        to_remove = ranked_articles[max_articles:]
+        
+        kept_ids = [item["article"]["_id"] for item in to_keep]
+        removed_ids = [item["article"]["_id"] for item in to_remove]
+        
+        kept_embeddings = [
+            np.array(item["article"]["embedding"], dtype=np.float32) 
+            for item in to_keep if item["article"].get("embedding") is not None
+        ]
+        new_centroid = np.mean(kept_embeddings, axis=0) if kept_embeddings else None
+
+        update_doc = {
+            "article_ids": kept_ids,
+            "article_count": len(kept_ids),
+            "last_trimmed": now
+        }
+        if new_centroid is not None:
+            # Raw mean of the kept articles; clustering's running-mean update builds on it
+            update_doc["centroid_embedding"] = encode_embedding(new_centroid)
+        
+        detach_doc = {
+            "$set": {
+                "status": "archived_from_topic",
+                "archived_at": now,
+                "former_topic_id": str(topic["_id"])
+            },
+            "$unset": {"topic_id": ""}
+        }
+        
+        return {
+            "kept_ids": kept_ids,
+            "removed_ids": removed_ids,
+            "topic_update": {"$set": update_doc},
+            "detach_update": detach_doc
+        }
+    
     async def trim_topic_articles(self, topic_id: str) -> Dict[str, Any]:
         """
         Trim articles from a topic if it exceeds the flat MAX_ARTICLES_PER_TOPIC limit.
@@ -155,77 +220,110 @@ class MaintenanceService:
                 return {"trimmed": 0, "retained": current_count}
             
             articles = []
-            cursor = self.articles_collection.find({"_id": {"$in": topic["article_ids"]}})
+            cursor = self.articles_collection.find({"_id": {"$in": topic["article_ids"]}}, TRIM_ARTICLE_PROJECTION)
             async for article in cursor:
                 articles.append(article)
             
-            now = datetime.now(UK_TZ)
-            ranked_articles = []
-            
-            seed_id = str(topic["article_ids"][0]) if topic.get("article_ids") else None
-            
-            for article in articles:
-                score = self.rank_article(article, topic, now)
-                ranked_articles.append({
-                    "article": article,
-                    "score": score,
-                    "is_seed": str(article["_id"]) == seed_id
-                })
-            
-            # Sort by score
-            ranked_articles.sort(key=lambda x: (x["is_seed"], x["score"]), reverse=True)
-            
-            to_keep = ranked_articles[:max_articles]
-            to_remove = ranked_articles[max_articles:]
-            
-            kept_ids = [item["article"]["_id"] for item in to_keep]
-            removed_ids = [item["article"]["_id"] for item in to_remove]
+            plan = self._plan_topic_trim(topic, articles, datetime.now(UK_TZ))
             
             # Detach
-            if removed_ids:
+            if plan["removed_ids"]:
                 await self.articles_collection.update_many(
-                    {"_id": {"$in": removed_ids}},
-                    {
-                        "$set": {
-                            "status": "archived_from_topic",
-                            "archived_at": now,
-                            "former_topic_id": str(query_id)
-                        },
-                        "$unset": {"topic_id": ""}
-                    }
+                    {"_id": {"$in": plan["removed_ids"]}}, plan["detach_update"]
                 )
-            
-            kept_embeddings = [
-                np.array(item["article"]["embedding"]) 
-                for item in to_keep if item["article"].get("embedding") is not None
-            ]
-            new_centroid = np.mean(kept_embeddings, axis=0) if kept_embeddings else None
-
-            # Update the topic
-            update_doc = {
-                "article_ids": kept_ids,
-                "article_count": len(kept_ids),
-                "last_trimmed": now
-            }
-            if new_centroid is not None:
-                update_doc["centroid_embedding"] = new_centroid.tolist()
 
             # 👈 FIX: Use query_id here as well
-            await self.topics_collection.update_one({"_id": query_id}, {"$set": update_doc})
+            await self.topics_collection.update_one({"_id": query_id}, plan["topic_update"])
             
-            logger.info(f"🔪 Trimmed topic {topic_id}: Removed {len(removed_ids)}, Kept {len(kept_ids)}")
+            logger.info(f"🔪 Trimmed topic {topic_id}: Removed {len(plan['removed_ids'])}, Kept {len(plan['kept_ids'])}")
             
             return {
-                "trimmed": len(removed_ids),
-                "retained": len(kept_ids),
+                "trimmed": len(plan["removed_ids"]),
+                "retained": len(plan["kept_ids"]),
                 "max_allowed": max_articles
             }
             
         except Exception as e:
-            logger.error(f"Failed to trim topic {topic_id}: {e}")
-            traceback.print_exc()
+            # Stack traces only at DEBUG; print_exc wrote them synchronously to stderr
+            logger.error(f"Failed to trim topic {topic_id}: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return {"error": str(e)}
     
+    async def trim_topics_bulk(self, topic_ids: List[ObjectId]) -> Dict[str, int]:
+        """
+        Trim many topics at once: per TRIM_BATCH_SIZE topics, one read per collection and
+        one bulk_write per collection instead of a round-trip per topic. Batching keeps
+        a large backlog from loading every oversized topic's articles at once.
+        """
+        stats = {"topics_trimmed": 0, "articles_trimmed": 0}
+        batch_size = self.config.TRIM_BATCH_SIZE
+        for i in range(0, len(topic_ids), batch_size):
+            batch_stats = await self._trim_topic_batch(topic_ids[i:i + batch_size])
+            stats["topics_trimmed"] += batch_stats["topics_trimmed"]
+            stats["articles_trimmed"] += batch_stats["articles_trimmed"]
+            if "error" in batch_stats:
+                # Later batches still run; the next light pass retries this one
+                stats["error"] = batch_stats["error"]
+        
+        logger.info(f"🔪 Bulk trimmed {stats['topics_trimmed']} topics, detached {stats['articles_trimmed']} articles")
+        return stats
+    
+    async def _trim_topic_batch(self, topic_ids: List[ObjectId]) -> Dict[str, int]:
+        """One read per collection and one bulk_write per collection for a batch of topics"""
+        stats = {"topics_trimmed": 0, "articles_trimmed": 0}
+        if not topic_ids:
+            return stats
+        
+        max_articles = self.config.MAX_ARTICLES_PER_TOPIC
+        topics = []
+        cursor = self.topics_collection.find({"_id": {"$in": topic_ids}}, TRIM_TOPIC_PROJECTION)
+        async for topic in cursor:
+            if len(topic.get("article_ids", [])) > max_articles:
+                topics.append(topic)
+        
+        if not topics:
+            return stats
+        
+        articles_by_id = {}
+        # Deduplicated: an article id can appear under more than one topic (or twice in one)
+        all_article_ids = list({aid for topic in topics for aid in topic["article_ids"]})
+        cursor = self.articles_collection.find({"_id": {"$in": all_article_ids}}, TRIM_ARTICLE_PROJECTION)
+        async for article in cursor:
+            articles_by_id[article["_id"]] = article
+        
+        now = datetime.now(UK_TZ)
+        topic_ops = []
+        article_ops = []
+        
+        for topic in topics:
+            articles = [articles_by_id[aid] for aid in topic["article_ids"] if aid in articles_by_id]
+            plan = self._plan_topic_trim(topic, articles, now)
+            
+            topic_ops.append(UpdateOne({"_id": topic["_id"]}, plan["topic_update"]))
+            if plan["removed_ids"]:
+                article_ops.append(UpdateMany({"_id": {"$in": plan["removed_ids"]}}, plan["detach_update"]))
+                stats["topics_trimmed"] += 1
+                stats["articles_trimmed"] += len(plan["removed_ids"])
+        
+        try:
+            if article_ops:
+                await self.articles_collection.bulk_write(article_ops, ordered=False)
+            await self.topics_collection.bulk_write(topic_ops, ordered=False)
+        except Exception as e:
+            logger.error(f"Bulk trim failed: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
+            return {"topics_trimmed": 0, "articles_trimmed": 0, "error": str(e)}
+        
+        return stats
+    
+    async def get_oversized_topic_ids(self) -> List[ObjectId]:
+        """IDs of active topics holding more than MAX_ARTICLES_PER_TOPIC articles"""
+        # "article_ids.<N>" exists only when the array has more than N elements
+        query = {
+            "status": "active",
+            f"article_ids.{self.config.MAX_ARTICLES_PER_TOPIC}": {"$exists": True}
+        }
+        cursor = self.topics_collection.find(query, {"_id": 1})
+        return [topic["_id"] async for topic in cursor]
+    
     async def purge_deleted_articles(self) -> int:
         delete_cutoff = datetime.now(UK_TZ) - timedelta(days=self.config.ARCHIVED_ARTICLE_PURGE_DAYS)
         result = await self.articles_collection.delete_many({
@@ -239,7 +337,8 @@ class MaintenanceService:
         return result.deleted_count
     
     async def cleanup_orphan_articles(self) -> int:
-        cutoff_date = datetime.now(UK_TZ) - timedelta(days=self.config.ORPHAN_ARTICLE_GRACE_DAYS)
+        now = datetime.now(UK_TZ)
+        cutoff_date = now - timedelta(days=self.config.ORPHAN_ARTICLE_GRACE_DAYS)
         result = await self.articles_collection.update_many(
             {
                 "status": "pending_clustering",
@@ -248,7 +347,7 @@ class MaintenanceService:
             {
                 "$set": {
                     "status": "archived_orphan",
-                    "archived_at": datetime.now(UK_TZ)
+                    "archived_at": now
                 }
             }
         )
@@ -276,18 +375,19 @@ class MaintenanceService:
         cursor = self.topics_collection.find({
             "status": "archived",
             "archived_at": {"$lt": delete_cutoff}
-        })
+        }, {"_id": 1})
+        topic_ids = [topic["_id"] async for topic in cursor]
         
-        async for topic in cursor:
+        if topic_ids:
             await self.articles_collection.update_many(
-                {"topic_id": topic["_id"]},
+                {"topic_id": {"$in": topic_ids}},
                 {
                     "$set": {"status": "archived_topic_deleted", "archived_at": now},
                     "$unset": {"topic_id": ""}
                 }
             )
-            await self.topics_collection.delete_one({"_id": topic["_id"]})
-            stats["deleted"] += 1
+            result = await self.topics_collection.delete_many({"_id": {"$in": topic_ids}})
+            stats["deleted"] = result.deleted_count
         
         return stats
     
@@ -295,21 +395,22 @@ class MaintenanceService:
         cursor = self.topics_collection.find({
             "article_count": {"$lt": self.config.MIN_TOPIC_ARTICLES},
             "status": {"$in": ["stale", "archived"]}
-        })
+        }, {"_id": 1})
+        topic_ids = [topic["_id"] async for topic in cursor]
         
-        deleted = 0
-        async for topic in cursor:
-            await self.articles_collection.update_many(
-                {"topic_id": topic["_id"]},
-                {
-                    "$set": {"status": "pending_clustering"},
-                    "$unset": {"topic_id": ""}
-                }
-            )
-            await self.topics_collection.delete_one({"_id": topic["_id"]})
-            deleted += 1
-            
-        return deleted
+        if not topic_ids:
+            return 0
+        
+        # Reset every affected article and drop every topic in one round-trip each
+        await self.articles_collection.update_many(
+            {"topic_id": {"$in": topic_ids}},
+            {
+                "$set": {"status": "pending_clustering"},
+                "$unset": {"topic_id": ""}
+            }
+        )
+        result = await self.topics_collection.delete_many({"_id": {"$in": topic_ids}})
+        return result.deleted_count
     
     async def run_full_maintenance(self) -> Dict[str, Any]:
         logger.info("=" * 80)
@@ -323,12 +424,9 @@ class MaintenanceService:
         }
         
         logger.info("\n[1/5] Trimming oversized topics...")
-        cursor = self.topics_collection.find({"status": "active"})
-        async for topic in cursor:
-            result = await self.trim_topic_articles(topic["_id"])
-            if result.get("trimmed", 0) > 0:
-                stats["topics_trimmed"] += 1
-                stats["articles_trimmed"] += result["trimmed"]
+        trim_stats = await self.trim_topics_bulk(await self.get_oversized_topic_ids())
+        stats["topics_trimmed"] = trim_stats["topics_trimmed"]
+        stats["articles_trimmed"] = trim_stats["articles_trimmed"]
         
         logger.info("\n[2/5] Purging permanently deleted articles...")
         stats["articles_purged"] = await self.purge_deleted_articles()
@@ -358,8 +456,9 @@ class MaintenanceService:
         return stats
     
     async def close(self):
-        self.client.close()
-        logger.info("MongoDB connection closed")
+        if self._owns_client:
+            await self.client.close()
+            logger.info("MongoDB connection closed")
 
 async def main():
     service = None
@@ -1,24 +1,27 @@
 # app/ai_pipeline/clustering.py
 """
 PodNova Clustering Module
-FULLY ASYNC VERSION with Motor
+FULLY ASYNC VERSION with native async PyMongo
 """
 from app.config import MONGODB_URI, MONGODB_DB_NAME
 import os
-import json
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 import numpy as np
-import motor.motor_asyncio
+from pymongo import AsyncMongoClient, UpdateOne
 import certifi
 from google import genai
 from google.genai import types
+from pydantic import BaseModel, TypeAdapter, ValidationError
 import asyncio
 import logging
 
 # Import services
 from app.ai_pipeline.article_maintenance import MaintenanceService
-from app.ai_pipeline.topic_history import TopicHistoryService
+from app.ai_pipeline.ingestion import article_llm_preview
+from app.ai_pipeline.topic_history import (
+    TopicHistoryService, normalize_embedding, encode_embedding, decode_embedding, metadata_cache_key
+)
 from app.controllers.discussion_controller import create_or_get_topic_discussion
 
 # Configuration
@@ -29,17 +32,102 @@ TOPIC_INACTIVE_DAYS = 90
 EMBEDDING_MODEL = "gemini-embedding-001"
 TEXT_MODEL = "gemini-2.5-flash"
 
+# Fields the title prompt reads; everything else stays on the server
+TITLE_TOPIC_PROJECTION = {"article_ids": 1, "category": 1}
+# Content is only a fallback preview (first 300 characters), so it is cut server-side
+TITLE_ARTICLE_PROJECTION = {
+    "llm_preview": 1, "title": 1, "description": 1,
+    "content": {"$substrCP": [{"$ifNull": ["$content", ""]}, 0, 300]}
+}
+# Cache namespace for initial titles in the shared topic_metadata_cache; bump when the prompt changes
+TITLE_CACHE_TYPE = "initial_title:v2"
+# Topics titled per Gemini request in the pending-title pass, and ready topics handed
+# to generate_pending_titles at a time while the cursor is still being read
+TITLE_BATCH_SIZE = 5
+TITLE_PASS_SIZE = 50
+# Title chunks in flight at once; the cursor waits for a slot before handing off another
+TITLE_PASS_CONCURRENCY = 2
+
+# Static part of every title request, sent as the system instruction so the prefix is
+# identical across calls (and eligible for Gemini's implicit prompt caching)
+TITLE_RULES = """RULES FOR THE HEADLINE:
+- MAX 10 WORDS
+- Say WHAT happened in plain English
+- Use everyday words, no jargon or slang
+- Be specific - include names, numbers, key details
+- Make it easy to understand in 2 seconds and INCLUSIVE FOR ALL COMPREHENSION LEVELS
+
+GOOD EXAMPLES (clear, specific):
+• "Google fined €2.4 billion by EU regulators"
+• "Tesla delays Cybertruck production to 2025"
+• "AI software creates fake videos of UK streets"
+• "US Supreme Court blocks Trump trade tariffs"
+• "Microsoft bug exposes confidential emails"
+
+BAD EXAMPLES (confusing, vague, jargon):
+• "AI slop costs threaten global economic reckoning" (uses slang, vague)
+• "Tech giant faces regulatory scrutiny" (too vague)
+• "The future of AI in question" (vague, says nothing)
+• "Paradigm shift in tech landscape" (jargon, meaningless)"""
+
+TITLE_FIELDS = """- **title** (string, MAX 10 WORDS): Clear, straightforward headline.
+- **summary** (string, 2-3 sentences): Clear overview of what happened.
+- **key_insights** (array, 3-5 strings): Specific, concrete takeaways.
+- **confidence_score** (integer, 0-100): How reliable is this information."""
+
+TITLE_SYSTEM_INSTRUCTION = f"""Write a clear, straightforward headline for a news podcast topic. Use simple words that everyone can understand.
+
+{TITLE_RULES}
+
+For each topic, generate a JSON object with:
+{TITLE_FIELDS}
+
+JSON only, no markdown."""
+
 # Initialize Gemini client
 client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
 
+
+class TopicTitle(BaseModel):
+    """Structured Gemini output for a new topic's title"""
+    title: str
+    summary: str
+    key_insights: List[str]
+    confidence_score: int
+
+
+class NumberedTopicTitle(TopicTitle):
+    """One entry of a batched title response, tied back to its topic by position"""
+    topic_number: int
+
+
+NUMBERED_TITLES = TypeAdapter(List[NumberedTopicTitle])
+
+
+def title_topic_block(topic: Dict[str, Any], articles: List[Dict[str, Any]]) -> str:
+    """The per-topic part of a title prompt: category, article count and up to 10 article summaries"""
+    # Ingestion stores llm_preview; older articles build it here (content arrives
+    # pre-truncated via TITLE_ARTICLE_PROJECTION)
+    article_texts = [article.get("llm_preview") or article_llm_preview(article) for article in articles[:10]]
+    
+    combined_articles = "\n---\n".join(article_texts)
+    
+    return f"""Category: {topic.get('category', 'general').upper()}
+Number of articles: {len(articles)}
+
+Articles:
+{combined_articles}"""
+
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 class ClusteringService:
-    def __init__(self, mongo_uri: str, db_name: str):
-        self.client_db = motor.motor_asyncio.AsyncIOMotorClient(
+    def __init__(self, mongo_uri: str, db_name: str, client: Optional[AsyncMongoClient] = None):
+        self._owns_client = client is None
+        self.client_db = client or AsyncMongoClient(
             mongo_uri, 
             tlsCAFile=certifi.where(),
             maxPoolSize=50,
@@ -49,8 +137,9 @@ class ClusteringService:
         self.articles_collection = self.db["articles"]
         self.topics_collection = self.db["topics"]
         
-        self.maintenance_service = MaintenanceService(mongo_uri, db_name)
-        self.history_service = TopicHistoryService(mongo_uri, db_name)
+        # Sub-services share this service's connection pool
+        self.maintenance_service = MaintenanceService(mongo_uri, db_name, client=self.client_db)
+        self.history_service = TopicHistoryService(mongo_uri, db_name, client=self.client_db)
         
         # 👈 NEW: STRICT SEMAPHORE TO PREVENT OOM CRASHES
         # Limits concurrent LLM calls and embedding generations
@@ -63,7 +152,17 @@ class ClusteringService:
             await self.topics_collection.create_index("category")
             await self.topics_collection.create_index("last_updated")
             await self.topics_collection.create_index("status")
-            await self.topics_collection.create_index([("category", 1), ("status", 1)])
+            # Equality on category/status/has_title, then the listing sort: serves the API topic
+            # lists and category counts, and supersedes the old (category, status) index
+            await self.topics_collection.create_index(
+                [("category", 1), ("status", 1), ("has_title", 1), ("last_updated", -1)]
+            )
+            try:
+                await self.topics_collection.drop_index("category_1_status_1")
+            except Exception:
+                pass  # Already dropped
+            # Untitled topics ready for a title: equality on status/has_title, range on article_count
+            await self.topics_collection.create_index([("status", 1), ("has_title", 1), ("article_count", 1)])
             logger.info("Clustering indexes verified")
         except Exception as e:
             logger.error(f"Error creating indexes: {e}")
@@ -78,9 +177,9 @@ class ClusteringService:
                 )
             
             if hasattr(response, 'embeddings') and len(response.embeddings) > 0:
-                return np.array(response.embeddings[0].values)
+                return np.array(response.embeddings[0].values, dtype=np.float32)
             elif hasattr(response, 'embedding'):
-                return np.array(response.embedding)
+                return np.array(response.embedding, dtype=np.float32)
             
             return None
             
@@ -88,10 +187,12 @@ class ClusteringService:
             logger.error(f"Error computing embedding: {str(e)}")
             return None
     
-    def cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
-        dot_product = np.dot(vec1, vec2)
-        norm_product = np.linalg.norm(vec1) * np.linalg.norm(vec2)
-        return float(dot_product / norm_product) if norm_product != 0 else 0.0
+    def centroid_similarity(self, article_unit: np.ndarray, topic: Dict[str, Any]) -> float:
+        """
+        Cosine similarity against a topic centroid for an already unit-length article embedding.
+        The stored centroid is the raw article mean, so it is normalized here rather than on write.
+        """
+        return float(np.dot(article_unit, normalize_embedding(topic["centroid_embedding"])))
     
     async def check_and_resurrect_topic(self, topic: Dict[str, Any]) -> bool:
         if topic.get("status") != "stale":
@@ -121,6 +222,8 @@ class ClusteringService:
     async def find_matching_topic(self, article_embedding: np.ndarray, category: str) -> Optional[Dict[str, Any]]:
         best_match = None
         best_similarity = 0.0
+        # Normalized once, so each topic comparison is a single dot product
+        article_unit = normalize_embedding(article_embedding)
         
         cursor = self.topics_collection.find({"category": category, "status": "active"})
         
@@ -128,8 +231,7 @@ class ClusteringService:
             if "centroid_embedding" not in topic:
                 continue
             
-            topic_embedding = np.array(topic["centroid_embedding"])
-            similarity = self.cosine_similarity(article_embedding, topic_embedding)
+            similarity = self.centroid_similarity(article_unit, topic)
             
             if similarity > best_similarity and similarity >= SIMILARITY_THRESHOLD:
                 best_similarity = similarity
@@ -143,8 +245,7 @@ class ClusteringService:
                 if "centroid_embedding" not in topic:
                     continue
                 
-                topic_embedding = np.array(topic["centroid_embedding"])
-                similarity = self.cosine_similarity(article_embedding, topic_embedding)
+                similarity = self.centroid_similarity(article_unit, topic)
                 
                 if similarity > best_similarity and similarity >= resurrection_threshold:
                     best_similarity = similarity
@@ -157,19 +258,21 @@ class ClusteringService:
         return best_match
     
     def calculate_new_centroid(self, old_centroid: List[float], new_embedding: np.ndarray, current_count: int) -> np.ndarray:
-        old_vec = np.array(old_centroid)
+        # Running mean: only valid because the stored centroid is the raw (unnormalized) mean
+        old_vec = decode_embedding(old_centroid)
         new_vec = ((old_vec * current_count) + new_embedding) / (current_count + 1)
         return new_vec
 
     async def create_new_topic(self, article_doc: Dict[str, Any], article_embedding: np.ndarray) -> str:
+        now = datetime.utcnow()
         topic_doc = {
             "category": article_doc["category"],
             "article_ids": [article_doc["_id"]],
             "sources": [article_doc["source"]],
-            "centroid_embedding": article_embedding.tolist(),
+            "centroid_embedding": encode_embedding(article_embedding),
             "confidence": 0.5,
-            "created_at": datetime.utcnow(),
-            "last_updated": datetime.utcnow(),
+            "created_at": now,
+            "last_updated": now,
             "status": "active",
             "article_count": 1,
             "has_title": False,
@@ -209,7 +312,7 @@ class ClusteringService:
         sources.add(article_doc["source"])
         
         new_centroid = self.calculate_new_centroid(
-            topic.get("centroid_embedding", article_embedding.tolist()), 
+            topic.get("centroid_embedding", article_embedding), 
             article_embedding, 
             current_count
         )
@@ -221,25 +324,28 @@ class ClusteringService:
             confidence = min(1.0, confidence + 0.05)
         
         update_fields = {
-            "article_ids": article_ids,
-            "sources": list(sources),
-            "centroid_embedding": new_centroid.tolist(),
+            "centroid_embedding": encode_embedding(new_centroid),
             "confidence": confidence,
-            "last_updated": datetime.utcnow(),
-            "article_count": len(article_ids)
+            "last_updated": datetime.utcnow()
         }
         
         if not topic.get("image_url") and article_doc.get("image_url"):
             update_fields["image_url"] = article_doc["image_url"]
         
-        await self.topics_collection.update_one({"_id": topic_id}, {"$set": update_fields})
+        # Append rather than rewrite the id/source arrays; article_count stays in step via $inc
+        await self.topics_collection.update_one({"_id": topic_id}, {
+            "$set": update_fields,
+            "$push": {"article_ids": article_doc["_id"]},
+            "$addToSet": {"sources": article_doc["source"]},
+            "$inc": {"article_count": 1}
+        })
         await self.articles_collection.update_one(
             {"_id": article_doc["_id"]},
             {"$set": {"topic_id": topic_id, "status": "clustered"}}
         )
         
         if topic.get("has_title"):
-            history_result = await self.history_service.check_and_create_history(str(topic_id))
+            history_result = await self.history_service.check_and_create_history(topic_id)
             if history_result and history_result.get("action") == "created_history":
                 logger.info(f"  ✨ Created {history_result['history_type']} history point")
         
@@ -265,88 +371,84 @@ class ClusteringService:
             logger.error(f"  Error creating discussion: {e}")
         return None
     
-    async def generate_topic_title(self, topic_id: str) -> bool:
-        try:
-            topic = await self.topics_collection.find_one({"_id": topic_id})
-            if not topic:
-                return False
-            
-            articles = []
-            cursor = self.articles_collection.find({"_id": {"$in": topic.get("article_ids", [])}})
-            async for article in cursor:
-                articles.append(article)
-            
-            if not articles:
-                return False
-            
-            article_texts = []
-            for article in articles[:10]:
-                description = article.get('description') or article.get('content', '')[:300]
-                article_texts.append(f"Title: {article.get('title')}\nSummary: {description}")
-            
-            combined_articles = "\n---\n".join(article_texts)
-            
-            prompt = f"""Write a clear, straightforward headline for a news podcast. Use simple words that everyone can understand.
-
-Category: {topic.get('category', 'general').upper()}
-Number of articles: {len(articles)}
-
-Articles:
-{combined_articles}
-
-RULES FOR THE HEADLINE:
-- MAX 10 WORDS
-- Say WHAT happened in plain English
-- Use everyday words, no jargon or slang
-- Be specific - include names, numbers, key details
-- Make it easy to understand in 2 seconds and INCLUSIVE FOR ALL COMPREHENSION LEVELS
-
-GOOD EXAMPLES (clear, specific):
-• "Google fined €2.4 billion by EU regulators"
-• "Tesla delays Cybertruck production to 2025"
-• "AI software creates fake videos of UK streets"
-• "US Supreme Court blocks Trump trade tariffs"
-• "Microsoft bug exposes confidential emails"
+    async def _stream_title_json(self, prompt: str, schema: Any) -> str:
+        """Run a schema-constrained title prompt and return the raw JSON text"""
+        # Streamed under the semaphore: chunks are collected as they arrive instead of after one long await
+        chunks = []
+        async with self.process_semaphore:
+            stream = await client.aio.models.generate_content_stream(
+                model=TEXT_MODEL,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    system_instruction=TITLE_SYSTEM_INSTRUCTION,
+                    response_mime_type="application/json",
+                    response_schema=schema,
+                )
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    chunks.append(chunk.text)
+        return "".join(chunks)
+    
+    async def _request_topic_title(self, topic: Dict[str, Any], articles: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Ask Gemini for a topic's title, summary and insights; None when it returns nothing usable"""
+        prompt = f"""{title_topic_block(topic, articles)}
 
-BAD EXAMPLES (confusing, vague, jargon):
-• "AI slop costs threaten global economic reckoning" (uses slang, vague)
-• "Tech giant faces regulatory scrutiny" (too vague)
-• "The future of AI in question" (vague, says nothing)
-• "Paradigm shift in tech landscape" (jargon, meaningless)
+Generate a JSON object for this topic."""
 
-Generate a JSON object with:
-- **title** (string, MAX 10 WORDS): Clear, straightforward headline.
-- **summary** (string, 2-3 sentences): Clear overview of what happened.
-- **key_insights** (array, 3-5 strings): Specific, concrete takeaways.
-- **confidence_score** (integer, 0-100): How reliable is this information.
+        # Schema-constrained output: no fence stripping, parsed and validated in one pass
+        try:
+            return TopicTitle.model_validate_json(await self._stream_title_json(prompt, TopicTitle)).model_dump()
+        except ValidationError:
+            return None
+    
+    async def _request_topic_titles(self, items: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Title several topics with one Gemini request; results line up with items,
+        None for any topic the response left out
+        """
+        sections = "\n\n".join(
+            f"TOPIC {number}\n{title_topic_block(topic, articles)}"
+            for number, (topic, articles) in enumerate(items, start=1)
+        )
+        prompt = f"""{sections}
 
-JSON only, no markdown:"""
+Generate a JSON array with one object for each of these {len(items)} topics, each also with:
+- **topic_number** (integer): The number of the topic it describes."""
 
-            # 👈 FIX: Wrap API call in semaphore
-            async with self.process_semaphore:
-                response = await client.aio.models.generate_content(
-                    model=TEXT_MODEL,
-                    contents=prompt,
-                    config=types.GenerateContentConfig(
-                        response_mime_type="application/json",
-                    )
-                )
-            
-            raw_text = response.text.strip()
-            if raw_text.startswith("```json"):
-                raw_text = raw_text.replace("```json", "", 1)
-                if raw_text.endswith("```"):
-                    raw_text = raw_text[:-3]
-            elif raw_text.startswith("```"):
-                raw_text = raw_text.replace("```", "", 1)
-                if raw_text.endswith("```"):
-                    raw_text = raw_text[:-3]
-            
-            result = json.loads(raw_text.strip())
-            
-            if not isinstance(result, dict) or not result.get("title"):
-                return False
-                
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        try:
+            titles = NUMBERED_TITLES.validate_json(await self._stream_title_json(prompt, List[NumberedTopicTitle]))
+        except ValidationError:
+            return results
+        except Exception as e:
+            logger.error(f"  Error generating batched titles: {e}")
+            return results
+        
+        for item in titles:
+            if 1 <= item.topic_number <= len(items):
+                results[item.topic_number - 1] = item.model_dump(exclude={"topic_number"})
+        return results
+    
+    async def _cache_topic_titles(self, entries: List[Tuple[str, Dict[str, Any]]]):
+        """Store fresh title results in the shared metadata cache (first writer wins)"""
+        if not entries:
+            return
+        now = datetime.utcnow()
+        await self.history_service.metadata_cache_collection.bulk_write([
+            UpdateOne({"_id": key}, {"$setOnInsert": {"result": result, "created_at": now}}, upsert=True)
+            for key, result in entries
+        ], ordered=False)
+    
+    async def _apply_topic_title(
+        self,
+        topic_id: str,
+        topic: Dict[str, Any],
+        result: Dict[str, Any],
+        now: Optional[datetime] = None
+    ) -> bool:
+        """Write a generated title to its topic, record the initial history point and open its discussion"""
+        try:
             title = result.get("title")
             
             await self.topics_collection.update_one(
@@ -357,14 +459,14 @@ JSON only, no markdown:"""
                         "summary": result.get("summary", ""),
                         "key_insights": result.get("key_insights", []),
                         "has_title": True,
-                        "title_generated_at": datetime.utcnow(),
+                        "title_generated_at": now or datetime.utcnow(),
                         "confidence": result.get("confidence_score", 70) / 100.0
                     }
                 }
             )
             
             await self.history_service.create_history_point(
-                str(topic_id), "initial", {"total_score": 1.0, "type": "initial_title"}, result
+                topic_id, "initial", {"total_score": 1.0, "type": "initial_title"}, result
             )
             
             await self.create_topic_discussion(
@@ -380,6 +482,136 @@ JSON only, no markdown:"""
             logger.error(f"  Error generating topic title: {str(e)}")
             return False
     
+    async def generate_topic_title(
+        self,
+        topic_id: str,
+        topic: Optional[Dict[str, Any]] = None,
+        articles: Optional[List[Dict[str, Any]]] = None
+    ) -> bool:
+        try:
+            if topic is None:
+                topic = await self.topics_collection.find_one({"_id": topic_id}, TITLE_TOPIC_PROJECTION)
+            if not topic:
+                return False
+            
+            if articles is None:
+                articles = []
+                cursor = self.articles_collection.find(
+                    {"_id": {"$in": topic.get("article_ids", [])}}, TITLE_ARTICLE_PROJECTION
+                )
+                async for article in cursor:
+                    articles.append(article)
+            
+            if not articles:
+                return False
+            
+            # Same article set, same prompt: reuse the earlier answer instead of paying for Gemini again
+            cache_key = metadata_cache_key([article["_id"] for article in articles], TITLE_CACHE_TYPE)
+            cached = await self.history_service.metadata_cache_collection.find_one(
+                {"_id": cache_key}, projection={"result": 1}
+            )
+            if cached:
+                logger.info(f"  Reusing cached title for topic {topic_id}")
+                result = cached["result"]
+            else:
+                result = await self._request_topic_title(topic, articles)
+                if result and result.get("title"):
+                    await self._cache_topic_titles([(cache_key, result)])
+            
+            if not result or not result.get("title"):
+                return False
+        
+        except Exception as e:
+            logger.error(f"  Error generating topic title: {str(e)}")
+            return False
+        
+        return await self._apply_topic_title(topic_id, topic, result)
+    
+    async def generate_pending_titles(self, ready_topics: List[Dict[str, Any]]) -> int:
+        """
+        Title every ready topic: cached results first, then the misses TITLE_BATCH_SIZE
+        topics per Gemini request, falling back to a single-topic request for any
+        topic a batch leaves out. Returns the number of topics titled.
+        """
+        # One $in read for every ready topic's articles instead of a query per topic
+        articles_by_id = {}
+        all_article_ids = list({aid for topic in ready_topics for aid in topic.get("article_ids", [])})
+        if all_article_ids:
+            try:
+                cursor = self.articles_collection.find(
+                    {"_id": {"$in": all_article_ids}}, TITLE_ARTICLE_PROJECTION
+                ).batch_size(200)
+                async for article in cursor:
+                    articles_by_id[article["_id"]] = article
+            except Exception as e:
+                # These topics stay untitled and are picked up again by the next pass
+                logger.error(f"  Error loading articles for titles: {e}")
+                return 0
+        
+        items = []
+        for topic in ready_topics:
+            articles = [articles_by_id[aid] for aid in topic.get("article_ids", []) if aid in articles_by_id]
+            if articles:
+                key = metadata_cache_key([article["_id"] for article in articles], TITLE_CACHE_TYPE)
+                items.append((key, topic, articles))
+        if not items:
+            return 0
+        
+        results = {}
+        try:
+            cursor = self.history_service.metadata_cache_collection.find(
+                {"_id": {"$in": [key for key, _, _ in items]}}, {"result": 1}
+            )
+            async for cached in cursor:
+                results[cached["_id"]] = cached["result"]
+        except Exception as e:
+            logger.error(f"  Error reading cached titles: {e}")
+            return 0
+        if results:
+            logger.info(f"  Reusing {len(results)} cached titles")
+        
+        misses = [item for item in items if item[0] not in results]
+        batches = [misses[i:i + TITLE_BATCH_SIZE] for i in range(0, len(misses), TITLE_BATCH_SIZE)]
+        
+        # Titles are network-bound; fan the batches out and let process_semaphore pace the Gemini calls
+        batch_results = await asyncio.gather(*(
+            self._request_topic_titles([(topic, articles) for _, topic, articles in batch])
+            for batch in batches
+        ))
+        
+        fresh = []
+        fallback = []
+        for batch, batch_result in zip(batches, batch_results):
+            for (key, topic, articles), result in zip(batch, batch_result):
+                if result and result.get("title"):
+                    fresh.append((key, result))
+                else:
+                    fallback.append((key, topic, articles))
+        
+        if fallback:
+            retried = await asyncio.gather(*(
+                self._request_topic_title(topic, articles) for _, topic, articles in fallback
+            ), return_exceptions=True)
+            for (key, _, _), result in zip(fallback, retried):
+                if isinstance(result, dict) and result.get("title"):
+                    fresh.append((key, result))
+                elif isinstance(result, Exception):
+                    logger.error(f"  Error generating topic title: {result}")
+        
+        try:
+            await self._cache_topic_titles(fresh)
+        except Exception as e:
+            logger.error(f"  Error caching titles: {e}")
+        results.update(fresh)
+        
+        # One timestamp for every title written by this pass
+        now = datetime.utcnow()
+        applied = await asyncio.gather(*(
+            self._apply_topic_title(topic["_id"], topic, results[key], now)
+            for key, topic, _ in items if key in results
+        ))
+        return sum(applied)
+    
     async def assign_to_topic(self, article_doc: Dict[str, Any]) -> Optional[str]:
         text_for_embedding = f"{article_doc['title']} {article_doc.get('description', '')}"
         
@@ -402,10 +634,11 @@ JSON only, no markdown:"""
             return await self.create_new_topic(article_doc, embedding)
     
     async def process_pending_articles(self) -> Dict[str, Any]:
-        logger.info(f"Starting Clustering at {datetime.utcnow().strftime('%H:%M:%S UTC')}")
+        start_time = datetime.utcnow()
+        logger.info(f"Starting Clustering at {start_time.strftime('%H:%M:%S UTC')}")
         
         cursor = self.articles_collection.find({"status": "pending_clustering"})
-        stats = {"processed": 0, "start_time": datetime.utcnow()}
+        stats = {"processed": 0, "start_time": start_time}
         
         async for article in cursor:
             try:
@@ -420,13 +653,38 @@ JSON only, no markdown:"""
             "status": "active",
             "article_count": {"$gte": MIN_ARTICLES_FOR_TITLE},
             "confidence": {"$gte": CONFIDENCE_THRESHOLD}
-        })
+        }, TITLE_TOPIC_PROJECTION)
         
+        # Hand ready topics off in chunks as the cursor yields them, so Gemini work on the
+        # first chunk overlaps with reading the rest. At most TITLE_PASS_CONCURRENCY chunks
+        # run at once, so a large backlog doesn't pile every chunk's articles into memory
+        slots = asyncio.Semaphore(TITLE_PASS_CONCURRENCY)
+        
+        async def run_chunk(topics):
+            try:
+                return await self.generate_pending_titles(topics)
+            finally:
+                slots.release()
+        
+        title_tasks = []
+        chunk = []
         async for topic in ready_cursor:
-            success = await self.generate_topic_title(topic["_id"])
-            if success:
-                # Sleep briefly between successful titles just to be extra safe with API limits
-                await asyncio.sleep(1) 
+            chunk.append(topic)
+            if len(chunk) == TITLE_PASS_SIZE:
+                await slots.acquire()
+                title_tasks.append(asyncio.create_task(run_chunk(chunk)))
+                chunk = []
+        if chunk:
+            await slots.acquire()
+            title_tasks.append(asyncio.create_task(run_chunk(chunk)))
+        
+        titles_generated = 0
+        for result in await asyncio.gather(*title_tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Error generating titles: {result}")
+            else:
+                titles_generated += result
+        stats["titles_generated"] = titles_generated
         
         return stats
     
@@ -438,9 +696,10 @@ JSON only, no markdown:"""
         )
     
     async def close(self):
-        self.client_db.close()
         await self.maintenance_service.close()
         await self.history_service.close()
+        if self._owns_client:
+            await self.client_db.close()
 
 async def main():
     service = ClusteringService(MONGODB_URI, MONGODB_DB_NAME)
@@ -1,10 +1,11 @@
 """
 PodNova Article Ingestion Module
-FULLY ASYNC VERSION with Motor and aiohttp
+FULLY ASYNC VERSION with native async PyMongo and aiohttp
 Fetches articles from RSS feeds, filters for quality, deduplicates, and stores in MongoDB.
 """
 import ssl
 import hashlib
+import time
 import re
 import logging
 from datetime import datetime, timedelta, timezone
@@ -13,7 +14,7 @@ from typing import List, Dict, Optional, Any
 
 import feedparser
 import certifi
-import motor.motor_asyncio
+from pymongo import AsyncMongoClient
 import aiohttp
 import asyncio
 from bs4 import BeautifulSoup
@@ -32,10 +33,41 @@ logger = logging.getLogger(__name__)
 # Set Local Timezone for the UK (handles GMT/BST automatically)
 UK_TZ = ZoneInfo("Europe/London")
 
+
+def article_llm_preview(article: Dict[str, Any]) -> str:
+    """The per-article text title prompts show: title plus description (or the first 300 characters of content)"""
+    description = article.get('description') or article.get('content', '')[:300]
+    return f"Title: {article.get('title')}\nSummary: {description}"
+
+
+class RateLimiter:
+    """Token bucket: up to `rate` acquisitions per second, with bursts of at most `capacity`"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Take one token, sleeping only as long as it takes for one to refill"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
 class ArticleIngestionService:
-    def __init__(self, mongo_uri: str, db_name: str):
-        """Initialize with Motor async client"""
-        self.client = motor.motor_asyncio.AsyncIOMotorClient(
+    def __init__(self, mongo_uri: str, db_name: str, client: Optional[AsyncMongoClient] = None):
+        """Initialize with native async PyMongo client (reuses a shared client when one is passed in)"""
+        self._owns_client = client is None
+        self.client = client or AsyncMongoClient(
             mongo_uri,
             tlsCAFile=certifi.where()
         )
@@ -44,6 +76,9 @@ class ArticleIngestionService:
         self.categories_collection = self.db["categories"]
 
         self.http_semaphore = asyncio.Semaphore(5)
+        # Polite pacing for article page fetches: the same ~10 requests/second ceiling the old
+        # fixed 0.5s sleep per slot gave, without idling a slot when the bucket has tokens
+        self.page_rate_limiter = RateLimiter(rate=10, capacity=5)
         
         # STRICT SEMAPHORE TO PREVENT OOM CRASHES
         # This forces the BeautifulSoup parser to only process 2 articles at a time
@@ -57,7 +92,9 @@ class ArticleIngestionService:
     async def init_session(self):
         """Initialize the shared aiohttp session for connection pooling with anti-bot headers."""
         if not self.session:
-            self.session = aiohttp.ClientSession(headers={
+            # One certifi-backed SSL context shared by every request on this session
+            ssl_context = ssl.create_default_context(cafile=certifi.where())
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=ssl_context), headers={
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
                 'Accept-Language': 'en-GB,en-US;q=0.9,en;q=0.8'
@@ -100,7 +137,7 @@ class ArticleIngestionService:
         """Extract full article content from URL using shared aiohttp session"""
         try:
             async with self.http_semaphore:
-                await asyncio.sleep(0.5)  # Polite delay to avoid rate limits
+                await self.page_rate_limiter.acquire()
                 async with self.session.get(url, timeout=15) as response:
                     if response.status != 200:
                         logger.debug(f"HTTP {response.status} for {url} - Likely paywall.")
@@ -430,6 +467,8 @@ class ArticleIngestionService:
             logger.debug(f"  [FALLBACK] Using RSS summary: {article_data['title'][:40]}")
 
         article_data["word_count"] = self.count_words(article_data["content"])
+        # Stored once so title prompts don't rebuild it for every topic and rerun
+        article_data["llm_preview"] = article_llm_preview(article_data)
 
         # 5. Length filter (content-based)
         if article_data["word_count"] > MAX_WORD_COUNT:
@@ -444,12 +483,13 @@ class ArticleIngestionService:
 
         return article_data
 
-    async def ingest_from_feed(self, feed_info: Dict, category: str) -> int:
-        """Ingest articles from a single RSS feed"""
+    async def ingest_from_feed(self, feed_info: Dict, category: str, entries: Optional[List[Dict]] = None) -> int:
+        """Ingest articles from a single RSS feed (pass pre-fetched entries to skip the fetch)"""
         feed_name = feed_info.get('name', feed_info.get('url', 'Unknown Feed'))
         logger.info(f"\nFetching from {feed_name} ({category})...")
 
-        entries = await self.fetch_feed(feed_info['url'])
+        if entries is None:
+            entries = await self.fetch_feed(feed_info['url'])
         logger.info(f"  Found {len(entries)} entries in feed")
 
         tasks = []
@@ -491,13 +531,24 @@ class ArticleIngestionService:
             "start_time": datetime.now(UK_TZ)
         }
 
+        # Fetch every feed concurrently up front (bounded by http_semaphore) so the
+        # round-trips overlap; articles are then processed feed by feed as before.
+        valid_feeds = [
+            (category, feed)
+            for category, feeds in RSS_FEEDS.items()
+            for feed in feeds
+            if isinstance(feed, dict) and 'url' in feed
+        ]
+        fetched = await asyncio.gather(*(self.fetch_feed(feed['url']) for _, feed in valid_feeds))
+        entries_by_url = {feed['url']: entries for (_, feed), entries in zip(valid_feeds, fetched)}
+
         for category, feeds in RSS_FEEDS.items():
             category_count = 0
             for feed in feeds:
                 if not isinstance(feed, dict) or 'url' not in feed:
                     continue
                 try:
-                    count = await self.ingest_from_feed(feed, category)
+                    count = await self.ingest_from_feed(feed, category, entries=entries_by_url[feed['url']])
                     category_count += count
                 except Exception as e:
                     logger.error(f"  Error processing feed {feed.get('name', 'unknown')}: {e}")
@@ -524,7 +575,8 @@ class ArticleIngestionService:
         """Close database connection and HTTP session"""
         if self.session:
             await self.session.close()
-        self.client.close()
+        if self._owns_client:
+            await self.client.close()
         logger.info("Connections closed")
 
 
@@ -5,10 +5,18 @@ FULLY ASYNC VERSION - SEQUENTIAL PIPELINE
 Protects against concurrent task overlapping and race conditions.
 """
 import asyncio
+import functools
+import queue
+import random
 import signal
+import time
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import logging
+import logging.handlers
+
+import certifi
+from pymongo import AsyncMongoClient
 
 from app.ai_pipeline.ingestion import ArticleIngestionService
 from app.ai_pipeline.clustering import ClusteringService
@@ -17,149 +25,210 @@ from app.ai_pipeline.topic_history import TopicHistoryService
 from app.config import MONGODB_URI, MONGODB_DB_NAME
 
 # Set up logging
+# Records are handed to a queue on the event loop thread; a background listener
+# thread does the actual (blocking) stream/file writes.
+LOG_FILE = "podnova_scheduler.log"
+log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+file_handler = logging.handlers.RotatingFileHandler(LOG_FILE, maxBytes=10_000_000, backupCount=5)
+file_handler.setFormatter(log_formatter)
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(log_formatter)
+
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+
+# force=True: the pipeline modules imported above already called basicConfig
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(log_queue)],
+    force=True
 )
 logger = logging.getLogger(__name__)
 
 # Timezone Configuration
 UK_TZ = ZoneInfo("Europe/London")
 
+
+def timed(name: str, warn_seconds: float):
+    """
+    Log how long a scheduled job took; warn when it exceeds warn_seconds
+    (roughly 25% of the job's interval) so runaway jobs show up early.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                if duration > warn_seconds:
+                    logger.warning(f"{name} took {duration:.1f}s (threshold {warn_seconds:.0f}s)")
+                else:
+                    logger.info(f"{name} took {duration:.1f}s")
+        return wrapper
+    return decorator
+
+
 class PodNovaScheduler:
     def __init__(self):
-        """Initialize all services"""
-        self.ingestion_service = ArticleIngestionService(MONGODB_URI, MONGODB_DB_NAME)
-        self.clustering_service = ClusteringService(MONGODB_URI, MONGODB_DB_NAME)
-        self.maintenance_service = MaintenanceService(MONGODB_URI, MONGODB_DB_NAME)
-        self.history_service = TopicHistoryService(MONGODB_URI, MONGODB_DB_NAME)
+        """Initialize all services on one shared async PyMongo client (single pool, single set of monitors)"""
+        self.client = AsyncMongoClient(
+            MONGODB_URI,
+            tlsCAFile=certifi.where(),
+            maxPoolSize=100,
+            minPoolSize=10
+        )
+        self.ingestion_service = ArticleIngestionService(MONGODB_URI, MONGODB_DB_NAME, client=self.client)
+        self.clustering_service = ClusteringService(MONGODB_URI, MONGODB_DB_NAME, client=self.client)
+        self.maintenance_service = MaintenanceService(MONGODB_URI, MONGODB_DB_NAME, client=self.client)
+        self.history_service = TopicHistoryService(MONGODB_URI, MONGODB_DB_NAME, client=self.client)
         
         self.running = True
         self.active_tasks = set()
         
-        # Lock flags to prevent fork-bombing
-        self.is_pipeline_running = False
-        self.is_maintenance_running = False
+        # Per-job locks to prevent overlapping runs (fork-bombing) when a job outlives its interval.
+        # Light and full maintenance share a lock since both rewrite the same topics.
+        self._locks = {
+            "pipeline": asyncio.Lock(),
+            "maintenance": asyncio.Lock()
+        }
         
         # Schedule intervals
         self.PIPELINE_INTERVAL_HOURS = 4
         self.LIGHT_MAINTENANCE_INTERVAL_HOURS = 6
+        self.FULL_MAINTENANCE_HOUR = 3
+        self.FULL_MAINTENANCE_JITTER_SECONDS = 120
+        # A full run skipped because light maintenance holds the lock is retried this soon
+        self.FULL_MAINTENANCE_RETRY_SECONDS = 600
+        
+        # Track last run times on the monotonic clock so NTP/DST jumps can't stall or double-fire jobs
+        # (Initialize to the past to force immediate start)
+        past_time = time.monotonic() - timedelta(days=999).total_seconds()
+        self.last_pipeline = past_time
+        self.last_light_maintenance = past_time
         
-        # Track last run times (Initialize to the past to force immediate start)
-        past_date = datetime.now(UK_TZ) - timedelta(days=999)
-        self.last_pipeline = past_date
-        self.last_light_maintenance = past_date
-        self.last_full_maintenance = past_date
+        # Full maintenance fires once per deadline rather than polling for the 3 AM minute
+        self.next_full_maintenance = self._next_full_maintenance_deadline()
+    
+    def _next_full_maintenance_deadline(self) -> float:
+        """Monotonic deadline for the next 3 AM UK run (DST-aware, plus a little jitter)"""
+        now = datetime.now(UK_TZ)
+        target = now.replace(hour=self.FULL_MAINTENANCE_HOUR, minute=0, second=0, microsecond=0)
+        if target <= now:
+            target += timedelta(days=1)
+        
+        # Compare timestamps, not aware datetimes, so a DST change overnight is accounted for
+        delay = target.timestamp() - now.timestamp()
+        delay += random.uniform(0, self.FULL_MAINTENANCE_JITTER_SECONDS)
+        logger.info(f"Next full maintenance scheduled for {target.strftime('%Y-%m-%d %H:%M %Z')}")
+        return time.monotonic() + delay
     
     async def run_core_pipeline(self):
         """
         SEQUENTIAL PIPELINE: Ingestion -> Clustering -> History
         Ensures data flows logically and prevents race conditions.
         """
-        if self.is_pipeline_running:
+        if self._locks["pipeline"].locked():
             logger.warning("Pipeline is already running. Skipping this trigger.")
             return
 
-        self.is_pipeline_running = True
-        self.last_pipeline = datetime.now(UK_TZ) # Update immediately to reset timer
+        async with self._locks["pipeline"]:
+            self.last_pipeline = time.monotonic() # Update immediately to reset timer
+            await self._run_core_pipeline_steps()
 
+    @timed("Core pipeline", warn_seconds=3600)
+    async def _run_core_pipeline_steps(self):
         try:
             # 1. INGESTION
-            logger.info("=" * 80)
             logger.info("PIPELINE STEP 1: Article Ingestion")
-            logger.info("=" * 80)
             ingest_stats = await self.ingestion_service.run_ingestion()
             logger.info(f"Ingestion completed: {ingest_stats['total_ingested']} articles")
             
             # 2. CLUSTERING
-            logger.info("=" * 80)
             logger.info("PIPELINE STEP 2: Article Clustering")
-            logger.info("=" * 80)
             cluster_stats = await self.clustering_service.process_pending_articles()
             await self.clustering_service.mark_inactive_topics()
             logger.info(f"Clustering completed: {cluster_stats['processed']} articles clustered")
             
             # 3. HISTORY CHECK
-            logger.info("=" * 80)
             logger.info("PIPELINE STEP 3: Topic History Check")
-            logger.info("=" * 80)
             history_stats = await self.history_service.run_history_check_cycle()
             logger.info(f"History completed: {history_stats['histories_created']} snapshots created")
 
         except Exception as e:
             logger.error(f"Core Pipeline failed: {str(e)}", exc_info=True)
         finally:
-            self.is_pipeline_running = False
             logger.info("Core Pipeline Run Complete.")
 
     async def run_full_maintenance(self):
         """Full maintenance job - daily at 3 AM"""
-        if self.is_maintenance_running:
+        if self._locks["maintenance"].locked():
+            logger.warning(
+                f"Maintenance is already running. Retrying full maintenance in {self.FULL_MAINTENANCE_RETRY_SECONDS // 60} minutes."
+            )
             return
 
-        self.is_maintenance_running = True
-        self.last_full_maintenance = datetime.now(UK_TZ)
+        async with self._locks["maintenance"]:
+            # Only a run that actually starts moves the deadline on to the next 3 AM
+            self.next_full_maintenance = self._next_full_maintenance_deadline()
+            await self._run_full_maintenance_job()
 
+    @timed("Full maintenance", warn_seconds=6 * 3600)
+    async def _run_full_maintenance_job(self):
         try:
-            logger.info("=" * 80)
             logger.info("SCHEDULED JOB: Full Database Maintenance")
-            logger.info("=" * 80)
             await self.maintenance_service.run_full_maintenance()
+            # No-op once every stored centroid is packed float16
+            await self.history_service.migrate_centroid_encoding()
             logger.info("Full maintenance completed")
         except Exception as e:
             logger.error(f"Full maintenance failed: {str(e)}", exc_info=True)
-        finally:
-            self.is_maintenance_running = False
     
     async def run_light_maintenance(self):
         """Light maintenance - just trim oversized topics"""
-        if self.is_maintenance_running:
+        if self._locks["maintenance"].locked():
+            logger.warning("Maintenance is already running. Skipping light maintenance trigger.")
             return
 
-        self.is_maintenance_running = True
-        self.last_light_maintenance = datetime.now(UK_TZ)
+        async with self._locks["maintenance"]:
+            self.last_light_maintenance = time.monotonic()
+            await self._run_light_maintenance_job()
 
+    @timed("Light maintenance", warn_seconds=5400)
+    async def _run_light_maintenance_job(self):
         try:
-            logger.info("=" * 80)
             logger.info("SCHEDULED JOB: Light Maintenance")
-            logger.info("=" * 80)
             
-            # Use streaming cursor to prevent RAM exhaustion when iterating topics
-            trimmed = 0
-            cursor = self.maintenance_service.topics_collection.find({"status": "active"})
-            async for topic in cursor:
-                result = await self.maintenance_service.trim_topic_articles(str(topic["_id"]))
-                if result.get("trimmed", 0) > 0:
-                    trimmed += 1
+            # Only oversized topic IDs come back, and all trims go out in one bulk write
+            topic_ids = await self.maintenance_service.get_oversized_topic_ids()
+            result = await self.maintenance_service.trim_topics_bulk(topic_ids)
             
-            logger.info(f"Light maintenance: {trimmed} topics trimmed")
+            logger.info(f"Light maintenance: {result['topics_trimmed']} topics trimmed")
         except Exception as e:
             logger.error(f"Light maintenance failed: {str(e)}", exc_info=True)
-        finally:
-            self.is_maintenance_running = False
     
     async def check_and_run_jobs(self):
-        """Check if it's time to run scheduled jobs based on UK time"""
-        now = datetime.now(UK_TZ)
+        """Check if it's time to run scheduled jobs against their monotonic deadlines"""
+        mono_now = time.monotonic()
         
-        if (now - self.last_pipeline).total_seconds() >= (self.PIPELINE_INTERVAL_HOURS * 3600):
+        if (mono_now - self.last_pipeline) >= (self.PIPELINE_INTERVAL_HOURS * 3600):
             task = asyncio.create_task(self.run_core_pipeline())
             self.active_tasks.add(task)
             task.add_done_callback(self.active_tasks.discard)
         
-        if (now - self.last_light_maintenance).total_seconds() >= (self.LIGHT_MAINTENANCE_INTERVAL_HOURS * 3600):
+        if (mono_now - self.last_light_maintenance) >= (self.LIGHT_MAINTENANCE_INTERVAL_HOURS * 3600):
             task = asyncio.create_task(self.run_light_maintenance())
             self.active_tasks.add(task)
             task.add_done_callback(self.active_tasks.discard)
         
-        if now.hour == 3 and now.minute == 0:
-            if (now - self.last_full_maintenance).total_seconds() > 3600:
-                task = asyncio.create_task(self.run_full_maintenance())
-                self.active_tasks.add(task)
-                task.add_done_callback(self.active_tasks.discard)
+        if mono_now >= self.next_full_maintenance:
+            # Provisional retry deadline; run_full_maintenance replaces it once it holds the lock
+            self.next_full_maintenance = mono_now + self.FULL_MAINTENANCE_RETRY_SECONDS
+            task = asyncio.create_task(self.run_full_maintenance())
+            self.active_tasks.add(task)
+            task.add_done_callback(self.active_tasks.discard)
     
     async def shutdown(self, sig=None):
         """Graceful shutdown"""
@@ -170,23 +239,22 @@ class PodNovaScheduler:
             logger.info(f"Waiting for {len(self.active_tasks)} active jobs to complete...")
             await asyncio.gather(*self.active_tasks, return_exceptions=True)
         
+        # Services only release their own resources (e.g. HTTP session); the shared client closes once here
         await self.ingestion_service.close()
         await self.clustering_service.close()
-        await self.maintenance_service.close()
-        await self.history_service.close()
+        await self.client.close()
         
         logger.info("Scheduler stopped cleanly.")
+        log_listener.stop()
     
     async def start(self):
         """Start the scheduler"""
+        log_listener.start()
         loop = asyncio.get_running_loop()
         for sig in (signal.SIGTERM, signal.SIGINT):
             loop.add_signal_handler(sig, lambda s=sig: asyncio.create_task(self.shutdown(s)))
         
-        logger.info("=" * 80)
-        logger.info("PodNova Scheduler Starting (SEQUENTIAL PIPELINE)")
-        logger.info(f"Time: {datetime.now(UK_TZ).strftime('%Y-%m-%d %H:%M:%S %Z')}")
-        logger.info("=" * 80)
+        logger.info(f"PodNova Scheduler Starting (SEQUENTIAL PIPELINE) at {datetime.now(UK_TZ).strftime('%Y-%m-%d %H:%M:%S %Z')}")
         
         try:
             while self.running:
@@ -1,22 +1,23 @@
 # backend/app/ai_pipeline/topic_history.py
 """
 PodNova Topic History Module
-FULLY ASYNC VERSION with Motor
+FULLY ASYNC VERSION with native async PyMongo
 Manages longitudinal topic development with intelligent snapshot creation
 Tracks significant updates and regenerates titles/summaries when needed
 """
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
-from bson import ObjectId
-import motor.motor_asyncio
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from bson import Binary, ObjectId
+from pymongo import AsyncMongoClient, UpdateOne
 import numpy as np
 import certifi
+import hashlib
 import os
-import json
 import asyncio
-import traceback
 from google import genai
 from google.genai import types
+from pydantic import BaseModel, ValidationError
 import logging
 
 from app.config import MONGODB_URI, MONGODB_DB_NAME
@@ -25,11 +26,280 @@ from app.config import MONGODB_URI, MONGODB_DB_NAME
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sentinel: distinguishes "caller did not load last_history" from "topic has no history"
+_NOT_LOADED = object()
+
+# Fields the significance check reads; everything else (summary, insights...) is
+# only fetched when a history point is actually created
+SIGNIFICANCE_TOPIC_PROJECTION = {
+    "article_ids": 1, "sources": 1, "confidence": 1, "centroid_embedding": 1,
+    "status": 1, "title": 1,
+    # Denormalized count kept in step by every writer of article_ids
+    "article_count": 1
+}
+SIGNIFICANCE_HISTORY_PROJECTION = {
+    "topic_id": 1, "article_ids": 1, "sources": 1, "confidence": 1,
+    "centroid_embedding": 1, "created_at": 1
+}
+# ESR index for the history cycle: equality on status/has_title, then the _id keyset range
+CYCLE_INDEX = [("status", 1), ("has_title", 1), ("_id", 1)]
+
+# Fields copied into a history snapshot by build_history_point
+SNAPSHOT_TOPIC_PROJECTION = {
+    "title": 1, "summary": 1, "key_insights": 1, "article_ids": 1, "sources": 1,
+    "confidence": 1, "centroid_embedding": 1,
+    "category": 1, "image_url": 1
+}
+# Fields the regeneration prompt reads from the topic
+REGENERATION_TOPIC_PROJECTION = {"article_ids": 1, "category": 1, "summary": 1}
+# Fields the API timeline shows; skips article_ids, centroids and the significance breakdown
+TIMELINE_PROJECTION = {
+    "history_type": 1, "created_at": 1, "title": 1, "summary": 1, "key_insights": 1,
+    "article_count": 1, "sources": 1, "confidence": 1, "significance_score": 1,
+    "was_regenerated": 1, "development_note": 1
+}
+
+# History type for a snapshot whose dominant significance component scored above 0.7
+DOMINANT_HISTORY_TYPES = {
+    "embedding_drift": "major_update",
+    "source_diversity": "source_expansion",
+    "confidence_change": "confidence_shift"
+}
+
 # Model configuration
 EMBEDDING_MODEL = "gemini-embedding-001"
 TEXT_MODEL = "gemini-2.5-flash"
 
 
+def regeneration_articles_pipeline(article_ids: List[ObjectId], limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Aggregation that returns a representative slice of a topic's articles as
+    pre-formatted prompt chunks (plus their ids): the newest article of every
+    source first, then each source's next newest, capped at limit, newest first.
+    """
+    return [
+        {"$match": {"_id": {"$in": article_ids}}},
+        {"$project": {"title": 1, "source": 1, "published_date": 1, "description": 1, "content": 1}},
+        {"$setWindowFields": {
+            "partitionBy": "$source",
+            "sortBy": {"published_date": -1},
+            "output": {"source_rank": {"$documentNumber": {}}}
+        }},
+        {"$sort": {"source_rank": 1, "published_date": -1}},
+        {"$limit": limit},
+        {"$sort": {"published_date": -1}},
+        {"$project": {"chunk": {"$concat": [
+            "Title: ", {"$ifNull": ["$title", "Untitled"]},
+            "\nSource: ", {"$ifNull": ["$source", "Unknown"]},
+            "\nDate: ", {"$dateToString": {"format": "%Y-%m-%d", "date": "$published_date", "onNull": "Unknown"}},
+            "\nContent: ", {"$ifNull": ["$description", {"$ifNull": ["$content", "No content"]}]},
+            "\n"
+        ]}}},
+        {"$group": {"_id": None, "ids": {"$push": "$_id"}, "combined": {"$push": "$chunk"}}}
+    ]
+
+
+# Set differences against the joined last_history, computed in-engine by the cycle
+# pipeline so neither side's id/source arrays have to be shipped to Python
+SIGNIFICANCE_DELTA_FIELDS = {
+    "new_article_count": {"$size": {"$setDifference": [
+        {"$ifNull": ["$article_ids", []]}, {"$ifNull": ["$last_history.article_ids", []]}
+    ]}},
+    "new_sources": {"$setDifference": [
+        {"$ifNull": ["$sources", []]}, {"$ifNull": ["$last_history.sources", []]}
+    ]}
+}
+
+
+def significance_prefilter_expr(config: "HistoryConfig", now: datetime) -> Dict[str, Any]:
+    """
+    Server-side mirror of the cheap significance components (on top of
+    SIGNIFICANCE_DELTA_FIELDS). True when a topic could still reach the
+    threshold with a maximal embedding drift (the same bound
+    calculate_significance_score short-circuits on), when a periodic
+    snapshot is due, or when there is no history yet.
+    """
+    last = "$last_history"
+    new_articles = "$new_article_count"
+    new_sources = {"$size": "$new_sources"}
+    confidence_delta = {"$abs": {"$subtract": [
+        {"$ifNull": ["$confidence", 0.5]}, {"$ifNull": [f"{last}.confidence", 0.5]}
+    ]}}
+    hours_elapsed = {"$divide": [{"$subtract": [now, {"$ifNull": [f"{last}.created_at", now]}]}, 3600 * 1000]}
+    
+    scores = {
+        "article_growth": {"$min": [1.0, {"$divide": [new_articles, {"$cond": [
+            {"$gte": [new_articles, config.MIN_NEW_ARTICLES]}, 10, config.MIN_NEW_ARTICLES
+        ]}]}]},
+        "source_diversity": {"$min": [1.0, {"$divide": [new_sources, config.MIN_NEW_SOURCES]}]},
+        "confidence_change": {"$min": [1.0, {"$divide": [confidence_delta, config.CONFIDENCE_CHANGE]}]},
+        "embedding_drift": 1.0,
+        "time_factor": {"$min": [1.0, {"$divide": [hours_elapsed, config.TIME_ELAPSED_HOURS]}]},
+    }
+    upper_bound = {"$add": [
+        {"$multiply": [scores[name], weight]}
+        for name, weight in zip(config.SIGNIFICANCE_COMPONENTS, config.SIGNIFICANCE_WEIGHT_VECTOR)
+    ]}
+    
+    return {"$or": [
+        {"$eq": [{"$type": last}, "missing"]},
+        {"$and": [
+            {"$gte": [hours_elapsed, config.PERIODIC_SNAPSHOT_DAYS * 24]},
+            {"$gte": [{"$ifNull": ["$article_count", 0]}, 10]}
+        ]},
+        # Small slack so float summation order can't drop a borderline topic
+        {"$gte": [upper_bound, config.SIGNIFICANCE_THRESHOLD - 1e-9]}
+    ]}
+
+
+def build_column_scorer(config: "HistoryConfig") -> Callable[..., np.ndarray]:
+    """
+    Specialize the column-wise significance formula for one config: thresholds
+    are bound as closure constants and the weights as a ready float64 array,
+    so scoring a batch does no attribute or dict lookups.
+    """
+    min_new_articles = float(config.MIN_NEW_ARTICLES)
+    min_new_sources = float(config.MIN_NEW_SOURCES)
+    confidence_change = float(config.CONFIDENCE_CHANGE)
+    embedding_drift = float(config.EMBEDDING_DRIFT)
+    time_elapsed_hours = float(config.TIME_ELAPSED_HOURS)
+    periodic_hours = float(config.PERIODIC_SNAPSHOT_DAYS * 24)
+    periodic_floor = config.SIGNIFICANCE_THRESHOLD + 0.05
+    weights = np.asarray(config.SIGNIFICANCE_WEIGHT_VECTOR, dtype=np.float64)
+    
+    def score_columns(new_articles, new_sources, confidence, prev_confidence, drift, hours, article_counts):
+        article_score = np.minimum(1.0, new_articles / np.where(new_articles >= min_new_articles, 10.0, min_new_articles))
+        source_score = np.minimum(1.0, new_sources / min_new_sources)
+        confidence_score = np.minimum(1.0, np.abs(confidence - prev_confidence) / confidence_change)
+        drift_score = np.minimum(1.0, drift / embedding_drift)
+        time_score = np.minimum(1.0, hours / time_elapsed_hours)
+        
+        # Columns in SIGNIFICANCE_COMPONENTS order
+        totals = np.stack([article_score, source_score, confidence_score, drift_score, time_score], axis=1) @ weights
+        
+        is_periodic = (hours >= periodic_hours) & (article_counts >= 10)
+        return np.where(is_periodic, np.maximum(totals, periodic_floor), totals)
+    
+    return score_columns
+
+
+def build_scalar_scorer(config: "HistoryConfig") -> Callable[..., Tuple[float, float, float, float, bool, float]]:
+    """
+    Scalar counterpart of build_column_scorer for single-topic checks: the
+    drift-independent components, the periodic flag and their weighted sum,
+    with every threshold and weight bound as a closure constant.
+    """
+    min_new_articles = config.MIN_NEW_ARTICLES
+    min_new_sources = config.MIN_NEW_SOURCES
+    confidence_change = config.CONFIDENCE_CHANGE
+    time_elapsed_hours = config.TIME_ELAPSED_HOURS
+    periodic_hours = config.PERIODIC_SNAPSHOT_DAYS * 24
+    w_article, w_source, w_confidence, _, w_time = config.SIGNIFICANCE_WEIGHT_VECTOR
+    
+    def cheap_components(new_articles, new_source_count, confidence_delta, hours, article_count):
+        if new_articles >= min_new_articles:
+            article_score = min(1.0, new_articles / 10)
+        else:
+            article_score = min(1.0, new_articles / min_new_articles)
+        source_score = min(1.0, new_source_count / min_new_sources)
+        confidence_score = min(1.0, confidence_delta / confidence_change)
+        time_score = min(1.0, hours / time_elapsed_hours)
+        is_periodic = hours >= periodic_hours and article_count >= 10
+        partial = article_score * w_article + source_score * w_source + confidence_score * w_confidence + time_score * w_time
+        return article_score, source_score, confidence_score, time_score, is_periodic, partial
+    
+    return cheap_components
+
+
+def history_cycle_pipeline(
+    query: Dict[str, Any], limit: int, config: "HistoryConfig", now: datetime
+) -> List[Dict[str, Any]]:
+    """
+    One page of the history cycle: the significance fields of each topic joined
+    with its latest history point, so a whole batch arrives in one round-trip.
+    Topics that cannot be significant are dropped server-side; the page comes
+    back as one document with the remaining "candidates" and the page's
+    "last_id"/"scanned" so keyset pagination still advances past them.
+    """
+    return [
+        {"$match": query},
+        {"$sort": {"_id": 1}},
+        {"$limit": limit},
+        {"$project": SIGNIFICANCE_TOPIC_PROJECTION},
+        {"$lookup": {
+            "from": "topic_history",
+            "let": {"tid": "$_id"},
+            "pipeline": [
+                # Served by the (topic_id, created_at) index
+                {"$match": {"$expr": {"$eq": ["$topic_id", "$$tid"]}}},
+                {"$sort": {"created_at": -1}},
+                {"$limit": 1},
+                {"$project": SIGNIFICANCE_HISTORY_PROJECTION}
+            ],
+            "as": "last_history"
+        }},
+        {"$addFields": {"last_history": {"$arrayElemAt": ["$last_history", 0]}}},
+        {"$addFields": SIGNIFICANCE_DELTA_FIELDS},
+        {"$facet": {
+            "candidates": [
+                {"$match": {"$expr": significance_prefilter_expr(config, now)}},
+                {"$project": {"article_ids": 0, "last_history.article_ids": 0, "last_history.sources": 0}}
+            ],
+            "page": [{"$group": {"_id": None, "last_id": {"$max": "$_id"}, "scanned": {"$sum": 1}}}]
+        }}
+    ]
+
+
+def metadata_cache_key(article_ids: List[ObjectId], history_type: str) -> str:
+    """Content hash of the articles fed to a regeneration (order-independent) plus the update type"""
+    joined = b"|".join(sorted(str(article_id).encode() for article_id in article_ids))
+    return hashlib.blake2b(joined + history_type.encode(), digest_size=16).hexdigest()
+
+
+def topic_metadata_update(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Topic $set for a regenerated (or cached) metadata result"""
+    return {
+        "title": result["title"],
+        "summary": result["summary"],
+        "key_insights": result["key_insights"],
+        "confidence": result.get("confidence_score", 70) / 100.0,
+        "last_regenerated": utcnow(),
+        "development_note": result.get("development_note")
+    }
+
+
+def utcnow() -> datetime:
+    """
+    Current UTC time as a naive datetime: the form the (non tz_aware) Mongo
+    client stores and returns, without the deprecated datetime.utcnow()
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def as_object_id(topic_id: Union[str, ObjectId]) -> ObjectId:
+    """Parse a topic id once at the service boundary; already-parsed ObjectIds pass straight through"""
+    return topic_id if isinstance(topic_id, ObjectId) else ObjectId(topic_id)
+
+
+def encode_embedding(vec: Any) -> Binary:
+    """Store an embedding as packed float16 bytes: a quarter of the BSON double array it replaces"""
+    return Binary(np.asarray(vec, dtype=np.float16).tobytes(), subtype=0)
+
+
+def decode_embedding(value: Any) -> np.ndarray:
+    """float32 view of a stored embedding; accepts packed float16 bytes or a legacy list of floats"""
+    if isinstance(value, bytes):
+        return np.frombuffer(value, dtype=np.float16).astype(np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+def normalize_embedding(vec: Any) -> np.ndarray:
+    """L2-normalize an embedding (zeros stay zeros) so cosine similarity becomes a plain dot product"""
+    arr = decode_embedding(vec)
+    norm = np.linalg.norm(arr)
+    return arr / norm if norm != 0 else arr
+
+
 class HistoryConfig:
     """Configuration for topic history snapshots"""
     MIN_NEW_ARTICLES = 3          
@@ -46,6 +316,11 @@ class HistoryConfig:
         "time_factor": 0.10
     }
     
+    # Component order used by calculate_significance_score, with the weights
+    # materialized once as a tuple in the same order
+    SIGNIFICANCE_COMPONENTS = ("article_growth", "source_diversity", "confidence_change", "embedding_drift", "time_factor")
+    SIGNIFICANCE_WEIGHT_VECTOR = tuple(map(SIGNIFICANCE_WEIGHTS.__getitem__, SIGNIFICANCE_COMPONENTS))
+    
     SIGNIFICANCE_THRESHOLD = 0.55  
     
     HISTORY_TYPES = {
@@ -59,12 +334,31 @@ class HistoryConfig:
     
     MAX_HISTORY_POINTS = 50
     PERIODIC_SNAPSHOT_DAYS = 7
+    
+    # Topics scored together per batch in the history check cycle
+    CYCLE_BATCH_SIZE = 50
+    # Concurrent topic checks (kept under the client's maxPoolSize) and concurrent Gemini regenerations
+    CYCLE_CONCURRENCY = 32
+    GEMINI_CONCURRENCY = 4
+    
+    # How long regenerated metadata is reused for the same article set and history type
+    METADATA_CACHE_TTL_HOURS = 24
+
+
+class TopicMetadataUpdate(BaseModel):
+    """Structured Gemini output for regenerated topic metadata"""
+    title: str
+    summary: str
+    key_insights: List[str]
+    confidence_score: int
+    development_note: Optional[str] = None
 
 
 class TopicHistoryService:
-    def __init__(self, mongo_uri: str, db_name: str):
-        """Initialize topic history service with async Motor client"""
-        self.client_db = motor.motor_asyncio.AsyncIOMotorClient(
+    def __init__(self, mongo_uri: str, db_name: str, client: Optional[AsyncMongoClient] = None):
+        """Initialize topic history service with native async PyMongo client (reuses a shared client when one is passed in)"""
+        self._owns_client = client is None
+        self.client_db = client or AsyncMongoClient(
             mongo_uri, 
             tlsCAFile=certifi.where(),
             maxPoolSize=50,
@@ -75,26 +369,61 @@ class TopicHistoryService:
         self.articles_collection = self.db["articles"]
         self.history_collection = self.db["topic_history"]
         self.followers_collection = self.db["topic_followers"]
+        self.metadata_cache_collection = self.db["topic_metadata_cache"]
         self.config = HistoryConfig()
         
+        self._score_columns = build_column_scorer(self.config)
+        self._cheap_components = build_scalar_scorer(self.config)
+        
+        # Bounds concurrent topic checks in the cycle (under maxPoolSize)
+        self.cycle_semaphore = asyncio.Semaphore(self.config.CYCLE_CONCURRENCY)
+        # Concurrent checks can each trigger a regeneration; keep LLM calls separately limited
+        self.gemini_semaphore = asyncio.Semaphore(self.config.GEMINI_CONCURRENCY)
+        
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             logger.warning("GEMINI_API_KEY not set. Metadata regeneration will fail.")
         self.gemini_client = genai.Client(api_key=api_key) if api_key else None
         
-        asyncio.create_task(self._ensure_indexes())
+        self._indexes_task: Optional[asyncio.Task] = None
+        self._cycle_index_ready = False
+        try:
+            asyncio.get_running_loop()
+            self._indexes_task = asyncio.create_task(self._create_indexes())
+        except RuntimeError:
+            # Constructed outside an event loop (e.g. at controller import time);
+            # the first awaited entry point creates the indexes instead
+            pass
     
     async def _ensure_indexes(self):
+        """Wait for the one-off index creation (starting it if nothing has yet); instant once done"""
+        if self._indexes_task is None:
+            self._indexes_task = asyncio.create_task(self._create_indexes())
+        await asyncio.shield(self._indexes_task)
+    
+    async def _create_indexes(self):
         try:
             await self.history_collection.create_index([("topic_id", 1), ("created_at", -1)])
             await self.history_collection.create_index("created_at")
             await self.topics_collection.create_index("last_history_check")
-            await self.topics_collection.create_index([("status", 1), ("has_title", 1)])
+            # Serves the history cycle's _id-keyed batches without an in-memory sort
+            await self.topics_collection.create_index(CYCLE_INDEX)
+            self._cycle_index_ready = True
+            try:
+                # Its (status, has_title) prefix already serves every query the old index did
+                await self.topics_collection.drop_index("status_1_has_title_1")
+            except Exception:
+                pass  # Already dropped
             
             # Index for the new mapping collection
             await self.followers_collection.create_index([("topic_id", 1), ("user_uid", 1)], unique=True)
             await self.followers_collection.create_index("user_uid")
             
+            # Regenerated metadata cache: keyed by content hash on _id, expired by TTL
+            await self.metadata_cache_collection.create_index(
+                "created_at", expireAfterSeconds=self.config.METADATA_CACHE_TTL_HOURS * 3600
+            )
+            
             logger.info("Database indexes verified")
         except Exception as e:
             logger.error(f"Error creating indexes: {e}")
@@ -102,11 +431,13 @@ class TopicHistoryService:
     async def get_topic_timeline(self, topic_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Fetch the formatted history timeline for a topic"""
         try:
-            cursor = self.history_collection.find({"topic_id": ObjectId(topic_id)}).sort("created_at", -1).limit(limit)
+            cursor = self.history_collection.find(
+                {"topic_id": ObjectId(topic_id)}, projection=TIMELINE_PROJECTION
+            ).sort("created_at", -1).limit(limit)
             timeline = []
             
             async for point in cursor:
-                created_at = point.get("created_at") or datetime.utcnow()
+                created_at = point.get("created_at") or utcnow()
                 
                 timeline.append({
                     "id": str(point["_id"]),
@@ -127,128 +458,258 @@ class TopicHistoryService:
             logger.error(f"Error fetching topic timeline: {e}")
             return []
     
-    def cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        try:
-            vec1_np = np.array(vec1)
-            vec2_np = np.array(vec2)
-            dot_product = np.dot(vec1_np, vec2_np)
-            norm_product = np.linalg.norm(vec1_np) * np.linalg.norm(vec2_np)
-            return float(dot_product / norm_product) if norm_product != 0 else 0.0
-        except Exception as e:
-            logger.error(f"Error calculating cosine similarity: {e}")
-            return 0.0
+    def unit_centroid(self, doc: Dict[str, Any]) -> np.ndarray:
+        """
+        Unit-length float32 centroid for a topic/history document, parsed once and
+        cached on the document as "_centroid_np". Stored centroids are raw article
+        means (the clustering update needs their magnitude), so they are normalized here.
+        """
+        cached = doc.get("_centroid_np")
+        if cached is None:
+            cached = normalize_embedding(doc["centroid_embedding"])
+            doc["_centroid_np"] = cached
+        return cached
     
-    def calculate_significance_score(
-        self, topic: Dict[str, Any], last_history: Optional[Dict[str, Any]], current_stats: Dict[str, Any]
-    ) -> Tuple[float, Dict[str, Any]]:
-        weights = self.config.SIGNIFICANCE_WEIGHTS
-        breakdown = {}
-        total_score = 0.0
+    def centroid_similarity(self, doc1: Dict[str, Any], doc2: Dict[str, Any]) -> float:
+        """Cosine similarity between two stored centroids: a dot product of their cached unit vectors"""
+        return float(np.dot(self.unit_centroid(doc1), self.unit_centroid(doc2)))
+    
+    def compute_batch_drift(self, topics: List[Dict[str, Any]], last_histories: Dict[ObjectId, Dict[str, Any]]) -> Dict[ObjectId, float]:
+        """
+        Embedding drift (1 - cosine) for a whole batch of topics in one pass:
+        stack current and previous centroids into two (N, d) float32 matrices
+        and take row-wise dots over the product of row norms.
+        """
+        pairs = []
+        for topic in topics:
+            last_history = last_histories.get(topic["_id"])
+            if topic.get("centroid_embedding") and last_history and last_history.get("centroid_embedding"):
+                pairs.append((
+                    topic["_id"],
+                    decode_embedding(topic["centroid_embedding"]),
+                    decode_embedding(last_history["centroid_embedding"])
+                ))
+        if not pairs:
+            return {}
         
-        if not last_history:
-            return 1.0, {"type": "initial", "reason": "First snapshot"}
+        # Only stack vectors of the most common dimension; anything else takes the scalar path
+        dim = Counter(len(p[1]) for p in pairs).most_common(1)[0][0]
+        pairs = [p for p in pairs if len(p[1]) == dim and len(p[2]) == dim]
+        if not pairs:
+            return {}
         
-        # 1. ARTICLE TURNOVER
-        prev_ids = set(last_history.get("article_ids", []))
-        curr_ids = set(topic.get("article_ids", []))
-        new_articles_count = len(curr_ids - prev_ids)
+        current = np.stack([p[1] for p in pairs])
+        previous = np.stack([p[2] for p in pairs])
         
-        if new_articles_count >= self.config.MIN_NEW_ARTICLES:
-            article_score = min(1.0, new_articles_count / 10) 
+        dots = np.einsum("ij,ij->i", current, previous)
+        norms = np.linalg.norm(current, axis=1) * np.linalg.norm(previous, axis=1)
+        similarities = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+        return {p[0]: float(1 - sim) for p, sim in zip(pairs, similarities)}
+    
+    def score_batch(
+        self, topics: List[Dict[str, Any]], last_histories: Dict[ObjectId, Dict[str, Any]],
+        drift_by_topic: Dict[ObjectId, float], now: datetime
+    ) -> np.ndarray:
+        """
+        Total significance scores for a batch of cycle topics as column arrays
+        (same formula as _score_components, one numpy op per component).
+        Topics without history score 1.0; a centroid pair that missed the batch
+        drift is given a maximal drift so the scalar check decides it.
+        """
+        n = len(topics)
+        new_articles = np.empty(n)
+        new_sources = np.empty(n)
+        confidence = np.empty(n)
+        prev_confidence = np.empty(n)
+        hours = np.empty(n)
+        article_counts = np.empty(n)
+        drift = np.zeros(n)
+        has_history = np.zeros(n, dtype=bool)
+        
+        for i, topic in enumerate(topics):
+            last_history = last_histories.get(topic["_id"])
+            new_articles[i] = topic.get("new_article_count", 0)
+            new_sources[i] = len(topic.get("new_sources", []))
+            confidence[i] = topic.get("confidence", 0.5)
+            article_counts[i] = topic.get("article_count", 0)
+            if not last_history:
+                prev_confidence[i] = confidence[i]
+                hours[i] = 0.0
+                continue
+            has_history[i] = True
+            prev_confidence[i] = last_history.get("confidence", 0.5)
+            created_at = last_history.get("created_at", now)
+            if created_at.tzinfo is not None:
+                created_at = created_at.replace(tzinfo=None)
+            hours[i] = (now - created_at).total_seconds() / 3600
+            if topic["_id"] in drift_by_topic:
+                drift[i] = drift_by_topic[topic["_id"]]
+            elif topic.get("centroid_embedding") and last_history.get("centroid_embedding"):
+                drift[i] = np.inf
+        
+        totals = self._score_columns(new_articles, new_sources, confidence, prev_confidence, drift, hours, article_counts)
+        return np.where(has_history, totals, 1.0)
+    
+    def _score_components(
+        self, topic: Dict[str, Any], last_history: Dict[str, Any], current_stats: Dict[str, Any],
+        precomputed_drift: Optional[float], now: datetime
+    ) -> Dict[str, Any]:
+        """Raw significance component values for a topic against its last snapshot (no breakdown formatting)"""
+        config = self.config
+        # 1. ARTICLE TURNOVER (already computed server-side for cycle topics)
+        if "new_article_count" in topic:
+            new_articles_count = topic["new_article_count"]
         else:
-            article_score = min(1.0, new_articles_count / self.config.MIN_NEW_ARTICLES)
-            
-        breakdown["article_growth"] = {
-            "score": article_score,
-            "new_articles": new_articles_count,
-            "note": "Based on turnover rate"
-        }
-        total_score += article_score * weights["article_growth"]
+            prev_ids = set(last_history.get("article_ids", []))
+            new_articles_count = sum(1 for article_id in topic.get("article_ids", []) if article_id not in prev_ids)
         
         # 2. SOURCE DIVERSITY
-        prev_sources = set(last_history.get("sources", []))
-        current_sources = set(current_stats["sources"])
-        new_sources = current_sources - prev_sources
-        
-        source_score = min(1.0, len(new_sources) / self.config.MIN_NEW_SOURCES)
-        breakdown["source_diversity"] = {"score": source_score, "new_sources": list(new_sources)[:5]}
-        total_score += source_score * weights["source_diversity"]
+        if "new_sources" in topic:
+            new_sources = topic["new_sources"]
+        else:
+            new_sources = set(current_stats["sources"]).difference(last_history.get("sources", []))
         
         # 3. CONFIDENCE CHANGE
-        prev_confidence = last_history.get("confidence", 0.5)
-        current_confidence = current_stats["confidence"]
-        confidence_delta = abs(current_confidence - prev_confidence)
-        
-        confidence_score = min(1.0, confidence_delta / self.config.CONFIDENCE_CHANGE)
-        breakdown["confidence_change"] = {"score": confidence_score, "delta": confidence_delta}
-        total_score += confidence_score * weights["confidence_change"]
-        
-        # 4. EMBEDDING DRIFT
-        drift_score = 0.0
-        if last_history.get("centroid_embedding") and topic.get("centroid_embedding"):
-            similarity = self.cosine_similarity(last_history["centroid_embedding"], topic["centroid_embedding"])
-            drift = 1 - similarity
-            drift_score = min(1.0, drift / self.config.EMBEDDING_DRIFT)
-            breakdown["embedding_drift"] = {"score": drift_score, "similarity": similarity}
-        
-        total_score += drift_score * weights["embedding_drift"]
-        
-        # 5. TIME FACTOR
-        last_history_time = last_history.get("created_at", datetime.utcnow())
+        confidence_delta = abs(current_stats["confidence"] - last_history.get("confidence", 0.5))
+        
+        # 4. TIME FACTOR
+        last_history_time = last_history.get("created_at", now)
         if last_history_time.tzinfo is not None:
             last_history_time = last_history_time.replace(tzinfo=None)
             
-        time_elapsed = (datetime.utcnow() - last_history_time).total_seconds() / 3600
-        time_score = min(1.0, time_elapsed / self.config.TIME_ELAPSED_HOURS)
-        breakdown["time_factor"] = {"score": time_score, "hours_elapsed": time_elapsed}
-        total_score += time_score * weights["time_factor"]
+        time_elapsed = (now - last_history_time).total_seconds() / 3600
+        
+        article_score, source_score, confidence_score, time_score, is_periodic, partial_score = self._cheap_components(
+            new_articles_count, len(new_sources), confidence_delta, time_elapsed, current_stats["article_count"]
+        )
+        
+        components = {
+            "article_score": article_score, "new_articles": new_articles_count,
+            "source_score": source_score, "new_sources": new_sources,
+            "confidence_score": confidence_score, "confidence_delta": confidence_delta,
+            "time_score": time_score, "hours_elapsed": time_elapsed,
+            "drift_score": 0.0, "similarity": None, "drift_skipped": False,
+            "is_periodic": is_periodic
+        }
+        
+        # SHORT-CIRCUIT: if even a maximal drift score can't lift the cheap components
+        # over the threshold (and no periodic snapshot is due), skip the embeddings entirely
+        drift_weight = config.SIGNIFICANCE_WEIGHTS["embedding_drift"]
+        if not is_periodic and partial_score + drift_weight < config.SIGNIFICANCE_THRESHOLD:
+            components["drift_skipped"] = True
+            components["total_score"] = partial_score
+            return components
+        
+        # 5. EMBEDDING DRIFT
+        if precomputed_drift is not None:
+            components["similarity"] = 1 - precomputed_drift
+        elif last_history.get("centroid_embedding") and topic.get("centroid_embedding"):
+            components["similarity"] = self.centroid_similarity(last_history, topic)
+        
+        if components["similarity"] is not None:
+            drift = 1 - components["similarity"]
+            components["drift_score"] = min(1.0, drift / config.EMBEDDING_DRIFT)
+        
+        total_score = partial_score + components["drift_score"] * drift_weight
         
         # 6. PERIODIC TRIGGER
-        if (time_elapsed / 24) >= self.config.PERIODIC_SNAPSHOT_DAYS and current_stats["article_count"] >= 10:
+        if is_periodic:
+            total_score = max(total_score, config.SIGNIFICANCE_THRESHOLD + 0.05)
+        
+        components["total_score"] = total_score
+        return components
+    
+    def _format_breakdown(self, components: Dict[str, Any]) -> Dict[str, Any]:
+        """Per-component explanation stored on history points and used to pick the history type"""
+        breakdown = {
+            "article_growth": {
+                "score": components["article_score"],
+                "new_articles": components["new_articles"],
+                "note": "Based on turnover rate"
+            },
+            "source_diversity": {"score": components["source_score"], "new_sources": list(components["new_sources"])[:5]},
+            "confidence_change": {"score": components["confidence_score"], "delta": components["confidence_delta"]},
+        }
+        if components["similarity"] is not None:
+            breakdown["embedding_drift"] = {"score": components["drift_score"], "similarity": components["similarity"]}
+        breakdown["time_factor"] = {"score": components["time_score"], "hours_elapsed": components["hours_elapsed"]}
+        if components["is_periodic"]:
             breakdown["periodic_trigger"] = True
-            total_score = max(total_score, self.config.SIGNIFICANCE_THRESHOLD + 0.05)
         
-        breakdown["total_score"] = total_score
-        breakdown["is_significant"] = total_score >= self.config.SIGNIFICANCE_THRESHOLD
+        breakdown["total_score"] = components["total_score"]
+        breakdown["is_significant"] = True
+        return breakdown
+    
+    def calculate_significance_score(
+        self, topic: Dict[str, Any], last_history: Optional[Dict[str, Any]], current_stats: Dict[str, Any],
+        precomputed_drift: Optional[float] = None, now: Optional[datetime] = None
+    ) -> Tuple[float, Dict[str, Any]]:
+        """
+        Score how much a topic has changed since its last snapshot. The detailed
+        breakdown is only built for significant topics; the (majority) non-significant
+        path gets just the total.
+        """
+        now = now or utcnow()
+        
+        if not last_history:
+            return 1.0, {"type": "initial", "reason": "First snapshot"}
+        
+        components = self._score_components(topic, last_history, current_stats, precomputed_drift, now)
+        total_score = components["total_score"]
         
-        return total_score, breakdown
+        if total_score < self.config.SIGNIFICANCE_THRESHOLD:
+            return total_score, {
+                "total_score": total_score,
+                "is_significant": False,
+                "embedding_drift_skipped": components["drift_skipped"]
+            }
+        
+        return total_score, self._format_breakdown(components)
     
     def determine_history_type(self, breakdown: Dict[str, Any]) -> str:
         if breakdown.get("periodic_trigger"):
             return "periodic"
         
-        scores = {k: v.get("score", 0) for k, v in breakdown.items() if isinstance(v, dict) and "score" in v}
-        dominant = max(scores.items(), key=lambda x: x[1]) if scores else ("major_update", 1.0)
+        # First strictly-highest component score, in SIGNIFICANCE_COMPONENTS (= breakdown) order
+        dominant, dominant_score = None, -1.0
+        for name in self.config.SIGNIFICANCE_COMPONENTS:
+            component = breakdown.get(name)
+            if component is not None and component["score"] > dominant_score:
+                dominant, dominant_score = name, component["score"]
         
-        if dominant[0] == "embedding_drift" and dominant[1] > 0.7: return "major_update"
-        elif dominant[0] == "source_diversity" and dominant[1] > 0.7: return "source_expansion"
-        elif dominant[0] == "confidence_change" and dominant[1] > 0.7: return "confidence_shift"
+        if dominant_score > 0.7:
+            return DOMINANT_HISTORY_TYPES.get(dominant, "major_update")
         return "major_update"
     
-    async def regenerate_topic_metadata(self, topic_id: str, history_type: str) -> Dict[str, Any]:
+    async def regenerate_topic_metadata(self, topic_oid: ObjectId, history_type: str) -> Dict[str, Any]:
         """Regenerate title, summary, and insights using Async Gemini"""
         if not self.gemini_client:
             return {"error": "Gemini API not configured"}
         
         try:
-            topic = await self.topics_collection.find_one({"_id": ObjectId(topic_id)})
+            topic = await self.topics_collection.find_one({"_id": topic_oid}, projection=REGENERATION_TOPIC_PROJECTION)
             if not topic:
                 return {"error": "Topic not found"}
             
-            article_ids = topic.get("article_ids", [])
-            articles = []
-            cursor = self.articles_collection.find({"_id": {"$in": article_ids}}).sort("published_date", -1).limit(20)
-            async for article in cursor:
-                articles.append(article)
+            # The server picks and formats up to 10 articles (spread across sources), so only text comes back
+            cursor = await self.articles_collection.aggregate(
+                regeneration_articles_pipeline(topic.get("article_ids", []))
+            )
+            grouped = await cursor.to_list(1)
             
-            if not articles:
+            if not grouped:
                 return {"error": "No articles found"}
             
-            article_texts = []
-            for article in articles[:10]:
-                date_str = str(article.get("published_date", datetime.utcnow()))
-                desc = article.get('description', article.get('content', 'No content'))
-                article_texts.append(f"Title: {article.get('title')}\nSource: {article.get('source')}\nDate: {date_str}\nContent: {desc}\n")
+            # Same article set + same update type -> same prompt material, so reuse the last answer
+            cache_key = metadata_cache_key(grouped[0]["ids"], history_type)
+            cached = await self.metadata_cache_collection.find_one({"_id": cache_key}, projection={"result": 1})
+            if cached:
+                logger.info(f"♻️ Reusing cached metadata for topic {topic_oid}")
+                result = cached["result"]
+                await self.topics_collection.update_one({"_id": topic_oid}, {"$set": topic_metadata_update(result)})
+                return result
+            
+            combined_articles = "\n---\n".join(grouped[0]["combined"])
             
             context_note = ""
             if history_type == "major_update": context_note = "This is a MAJOR UPDATE to an ongoing story."
@@ -264,7 +725,7 @@ OLD SUMMARY (DO NOT REPEAT THIS):
 {topic.get('summary', 'No previous summary.')}
 
 NEW ARTICLES:
-{"".join(article_texts)}
+{combined_articles}
 
 RULES FOR THE UPDATE:
 1. Write a completely NEW summary focusing heavily on the NEW developments found in the articles.
@@ -295,132 +756,205 @@ Generate a JSON object with:
 - **summary** (string, 2-3 sentences): Clear overview of the NEW developments.
 - **key_insights** (array, 3-5 strings): Specific, concrete takeaways reflecting the latest updates.
 - **confidence_score** (integer, 0-100): How reliable is this information.
-- **development_note** (string, optional): A brief 1-sentence note on how the story changed.
+- **development_note** (string, optional): A brief 1-sentence note on how the story changed."""
 
-JSON only, no markdown:"""
-
-            response = await self.gemini_client.aio.models.generate_content(
-                model=TEXT_MODEL,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
+            # Streamed: chunks are collected as they arrive instead of after one long await
+            chunks = []
+            async with self.gemini_semaphore:
+                stream = await self.gemini_client.aio.models.generate_content_stream(
+                    model=TEXT_MODEL,
+                    contents=prompt,
+                    config=types.GenerateContentConfig(
+                        response_mime_type="application/json",
+                        response_schema=TopicMetadataUpdate,
+                    )
                 )
-            )
-            
-            raw_text = response.text.strip()
-            if raw_text.startswith("```json"):
-                raw_text = raw_text.replace("```json", "", 1)
-                if raw_text.endswith("```"):
-                    raw_text = raw_text[:-3]
-            elif raw_text.startswith("```"):
-                raw_text = raw_text.replace("```", "", 1)
-                if raw_text.endswith("```"):
-                    raw_text = raw_text[:-3]
+                async for chunk in stream:
+                    if chunk.text:
+                        chunks.append(chunk.text)
             
-            result = json.loads(raw_text.strip())
+            # Parsed and validated against the schema in one pass by pydantic-core
+            try:
+                result = TopicMetadataUpdate.model_validate_json("".join(chunks)).model_dump()
+            except ValidationError:
+                return {"error": "Gemini returned no structured metadata"}
             
-            update_data = {
-                "title": result["title"],
-                "summary": result["summary"],
-                "key_insights": result["key_insights"],
-                "confidence": result.get("confidence_score", 70) / 100.0,
-                "last_regenerated": datetime.utcnow(),
-                "development_note": result.get("development_note")
-            }
+            await self.metadata_cache_collection.update_one(
+                {"_id": cache_key},
+                {"$setOnInsert": {"result": result, "created_at": utcnow()}},
+                upsert=True
+            )
             
-            await self.topics_collection.update_one({"_id": ObjectId(topic_id)}, {"$set": update_data})
+            await self.topics_collection.update_one({"_id": topic_oid}, {"$set": topic_metadata_update(result)})
             return result
             
         except Exception as e:
             logger.error(f"Error regenerating metadata: {str(e)}")
             return {"error": str(e)}
     
-    async def create_history_point(self, topic_id: str, history_type: str, significance_breakdown: Dict[str, Any], regenerated_metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    async def build_history_point(self, topic_oid: ObjectId, history_type: str, significance_breakdown: Dict[str, Any], regenerated_metadata: Optional[Dict[str, Any]] = None, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Snapshot the topic into a history document (with its _id pre-assigned) without writing it"""
+        now = now or utcnow()
+        topic = await self.topics_collection.find_one({"_id": topic_oid}, projection=SNAPSHOT_TOPIC_PROJECTION)
+        if not topic:
+            return None
+        
+        return {
+            "_id": ObjectId(),
+            "topic_id": topic_oid,
+            "history_type": history_type,
+            "created_at": now,
+            "title": topic.get("title"),
+            "summary": topic.get("summary"),
+            "key_insights": topic.get("key_insights", []),
+            "article_count": len(topic.get("article_ids", [])),
+            "article_ids": topic.get("article_ids", []), 
+            "sources": topic.get("sources", []),
+            "confidence": topic.get("confidence", 0.5),
+            "centroid_embedding": encode_embedding(decode_embedding(topic["centroid_embedding"])) if topic.get("centroid_embedding") else None,
+            "category": topic.get("category"),
+            "image_url": topic.get("image_url"),
+            "significance_score": significance_breakdown.get("total_score", 1.0),
+            "significance_breakdown": significance_breakdown,
+            "was_regenerated": regenerated_metadata is not None,
+            "development_note": regenerated_metadata.get("development_note") if isinstance(regenerated_metadata, dict) else None
+        }
+    
+    async def create_history_point(self, topic_id: Union[str, ObjectId], history_type: str, significance_breakdown: Dict[str, Any], regenerated_metadata: Optional[Dict[str, Any]] = None, now: Optional[datetime] = None) -> Optional[str]:
+        now = now or utcnow()
+        topic_oid = as_object_id(topic_id)
         try:
-            topic = await self.topics_collection.find_one({"_id": ObjectId(topic_id)})
-            if not topic:
+            history_doc = await self.build_history_point(topic_oid, history_type, significance_breakdown, regenerated_metadata, now=now)
+            if not history_doc:
                 return None
             
-            history_doc = {
-                "topic_id": ObjectId(topic_id),
-                "history_type": history_type,
-                "created_at": datetime.utcnow(),
-                "title": topic.get("title"),
-                "summary": topic.get("summary"),
-                "key_insights": topic.get("key_insights", []),
-                "article_count": len(topic.get("article_ids", [])),
-                "article_ids": topic.get("article_ids", []), 
-                "sources": topic.get("sources", []),
-                "confidence": topic.get("confidence", 0.5),
-                "centroid_embedding": topic.get("centroid_embedding"),
-                "category": topic.get("category"),
-                "image_url": topic.get("image_url"),
-                "significance_score": significance_breakdown.get("total_score", 1.0),
-                "significance_breakdown": significance_breakdown,
-                "was_regenerated": regenerated_metadata is not None,
-                "development_note": regenerated_metadata.get("development_note") if isinstance(regenerated_metadata, dict) else None
-            }
-            
             result = await self.history_collection.insert_one(history_doc)
-            history_count = await self.history_collection.count_documents({"topic_id": ObjectId(topic_id)})
             
             await self.topics_collection.update_one(
-                {"_id": ObjectId(topic_id)},
-                {"$set": {"last_history_point": datetime.utcnow(), "history_point_count": history_count}}
+                {"_id": topic_oid},
+                {"$set": {"last_history_point": now}, "$inc": {"history_point_count": 1}}
             )
             logger.info(f"✅ Successfully saved history point '{history_type}' for {topic_id}")
             return str(result.inserted_id)
             
         except Exception as e:
-            logger.error(f"❌ Error creating history point: {e}")
-            traceback.print_exc()
+            # Stack traces only at DEBUG: this runs inside the concurrent history cycle
+            logger.error(f"❌ Error creating history point: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return None
     
-    async def check_and_create_history(self, topic_id: str) -> Optional[Dict[str, Any]]:
+    async def flush_history_points(self, history_docs: List[Dict[str, Any]], now: datetime) -> None:
+        """
+        Write a batch of built history points: one insert_many and one bulk_write
+        that stamps each topic and bumps its history_point_count by the points added.
+        """
+        if not history_docs:
+            return
+        
+        await self.history_collection.insert_many(history_docs, ordered=False)
+        
+        added = Counter(doc["topic_id"] for doc in history_docs)
+        await self.topics_collection.bulk_write([
+            UpdateOne(
+                {"_id": topic_id},
+                {"$set": {"last_history_point": now}, "$inc": {"history_point_count": count}}
+            )
+            for topic_id, count in added.items()
+        ], ordered=False)
+        logger.info(f"✅ Saved {len(history_docs)} history points")
+    
+    async def notify_followers(self, topic_id: str, topic_title: str, update_type: str) -> None:
+        """Push a topic update notification to every follower via the mapping collection"""
+        from app.services.notification_service import notification_service
+        
+        followers_cursor = self.followers_collection.find({"topic_id": topic_id})
+        async for follower in followers_cursor:
+            user_uid = follower.get("user_uid")
+            if user_uid:
+                try:
+                    await notification_service.create_topic_update_notification(
+                        user_id=user_uid,
+                        topic_id=topic_id,
+                        topic_title=topic_title,
+                        update_type=update_type,
+                        update_count=1
+                    )
+                except Exception as ne:
+                    logger.error(f"Failed to notify user {user_uid}: {ne}")
+    
+    async def check_and_create_history(
+        self, topic_id: Union[str, ObjectId], precomputed_drift: Optional[float] = None, last_history: Any = _NOT_LOADED,
+        now: Optional[datetime] = None, pending_history: Optional[List[Dict[str, Any]]] = None,
+        topic: Optional[Dict[str, Any]] = None, pending_notifications: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Score a topic and snapshot it if significant. Batch callers pass the
+        already-joined topic (SIGNIFICANCE_TOPIC_PROJECTION fields) and its
+        last_history (None when the topic has no history yet), one shared
+        timestamp for the whole batch, and a pending_history list that collects
+        snapshots for flush_history_points instead of writing each one. Follower
+        notifications for those snapshots go to pending_notifications, to be sent
+        with notify_followers once the flush has succeeded.
+        """
+        now = now or utcnow()
+        await self._ensure_indexes()
         try:
-            topic = await self.topics_collection.find_one({"_id": ObjectId(topic_id)})
+            topic_oid = as_object_id(topic_id)
+            topic_id = str(topic_oid)
+            if topic is None:
+                topic_query = self.topics_collection.find_one(
+                    {"_id": topic_oid}, projection=SIGNIFICANCE_TOPIC_PROJECTION
+                )
+                if last_history is _NOT_LOADED:
+                    # Both lookups go out together: one round-trip of latency instead of two
+                    topic, last_history = await asyncio.gather(
+                        topic_query,
+                        self.history_collection.find_one(
+                            {"topic_id": topic_oid}, projection=SIGNIFICANCE_HISTORY_PROJECTION,
+                            sort=[("created_at", -1)]
+                        )
+                    )
+                else:
+                    topic = await topic_query
+            
             if not topic or topic.get("status") != "active":
                 return None
             
-            last_history = await self.history_collection.find_one(
-                {"topic_id": ObjectId(topic_id)}, sort=[("created_at", -1)]
-            )
-            
             current_stats = {
-                "article_count": len(topic.get("article_ids", [])),
+                "article_count": topic.get("article_count", 0),
                 "sources": topic.get("sources", []),
                 "confidence": topic.get("confidence", 0.5)
             }
             
-            significance_score, breakdown = self.calculate_significance_score(topic, last_history, current_stats)
+            significance_score, breakdown = self.calculate_significance_score(
+                topic, last_history, current_stats, precomputed_drift=precomputed_drift, now=now
+            )
             
             if significance_score >= self.config.SIGNIFICANCE_THRESHOLD:
                 history_type = self.determine_history_type(breakdown)
                 
                 regenerated = None
                 if history_type in ["major_update", "source_expansion"]:
-                    regenerated = await self.regenerate_topic_metadata(topic_id, history_type)
+                    regenerated = await self.regenerate_topic_metadata(topic_oid, history_type)
                 
-                history_id = await self.create_history_point(topic_id, history_type, breakdown, regenerated)
+                if pending_history is not None:
+                    history_doc = await self.build_history_point(topic_oid, history_type, breakdown, regenerated, now=now)
+                    history_id = None
+                    if history_doc:
+                        pending_history.append(history_doc)
+                        history_id = str(history_doc["_id"])
+                else:
+                    history_id = await self.create_history_point(topic_oid, history_type, breakdown, regenerated, now=now)
                 
                 if history_id:
-                    # Trigger Push Notifications to all followers via mapping collection
-                    from app.services.notification_service import notification_service
-                    
-                    followers_cursor = self.followers_collection.find({"topic_id": str(topic_id)})
-                    async for follower in followers_cursor:
-                        user_uid = follower.get("user_uid")
-                        if user_uid:
-                            try:
-                                await notification_service.create_topic_update_notification(
-                                    user_id=user_uid,
-                                    topic_id=topic_id,
-                                    topic_title=regenerated["title"] if regenerated else topic.get("title", "Topic"),
-                                    update_type=history_type,
-                                    update_count=1
-                                )
-                            except Exception as ne:
-                                logger.error(f"Failed to notify user {user_uid}: {ne}")
+                    notification = {
+                        "topic_id": topic_id,
+                        "topic_title": regenerated["title"] if regenerated else topic.get("title", "Topic"),
+                        "update_type": history_type
+                    }
+                    if pending_notifications is not None:
+                        pending_notifications.append(notification)
+                    else:
+                        await self.notify_followers(**notification)
 
                     return {
                         "action": "created_history",
@@ -437,21 +971,43 @@ JSON only, no markdown:"""
             logger.error(f"Error checking history for topic {topic_id}: {e}")
             return None
     
-    async def run_history_check_cycle(self) -> Dict[str, Any]:
-        logger.info(f"Topic History Check Cycle Started at {datetime.utcnow().strftime('%H:%M:%S UTC')}")
+    async def _process_history_batch(self, batch_topics: List[Dict[str, Any]], stats: Dict[str, Any], batch_now: datetime) -> None:
+        """
+        Score one batch of joined topics (see history_cycle_pipeline): embedding drift
+        and total scores are computed for the whole batch at once, and only the
+        topics that clear the threshold go through check_and_create_history
+        """
+        last_histories = {}
+        for topic in batch_topics:
+            # Not cached: the pipeline strips the article_ids/sources the single-topic path needs
+            last_history = topic.pop("last_history", None)
+            if last_history:
+                last_histories[topic["_id"]] = last_history
+        drift_by_topic = self.compute_batch_drift(batch_topics, last_histories)
         
-        stats = {
-            "topics_checked": 0, "histories_created": 0, "by_type": {}, 
-            "regenerations": 0, "start_time": datetime.utcnow(), "errors": 0
-        }
+        totals = self.score_batch(batch_topics, last_histories, drift_by_topic, batch_now)
+        # Slack so float summation order can't drop a borderline topic; the scalar check has the final say
+        significant = [
+            topic for topic, total in zip(batch_topics, totals)
+            if total >= self.config.SIGNIFICANCE_THRESHOLD - 1e-9
+        ]
+        stats["topics_checked"] += len(batch_topics) - len(significant)
+        pending_history = []
+        pending_notifications = []
         
-        try:
-            cursor = self.topics_collection.find({"status": "active", "has_title": True})
-            
-            async for topic in cursor:
+        async def _check_one(topic: Dict[str, Any]) -> None:
+            async with self.cycle_semaphore:
                 try:
                     stats["topics_checked"] += 1
-                    result = await self.check_and_create_history(str(topic["_id"]))
+                    result = await self.check_and_create_history(
+                        topic["_id"],
+                        precomputed_drift=drift_by_topic.get(topic["_id"]),
+                        last_history=last_histories.get(topic["_id"]),
+                        now=batch_now,
+                        pending_history=pending_history,
+                        topic=topic,
+                        pending_notifications=pending_notifications
+                    )
                     
                     if result and result.get("action") == "created_history":
                         stats["histories_created"] += 1
@@ -460,26 +1016,110 @@ JSON only, no markdown:"""
                         
                         if result.get("was_regenerated"):
                             stats["regenerations"] += 1
-                            
-                    await asyncio.sleep(0.01)
                     
                 except Exception as e:
                     logger.error(f"Error processing topic {topic.get('_id')}: {e}")
                     stats["errors"] += 1
+        
+        # Overlap the per-topic Mongo round-trips; stats is only touched from the event loop thread
+        await asyncio.gather(*(_check_one(topic) for topic in significant), return_exceptions=True)
+        
+        try:
+            await self.flush_history_points(pending_history, batch_now)
+        except Exception as e:
+            logger.error(f"❌ Error saving batch of {len(pending_history)} history points: {e}")
+            stats["errors"] += 1
+            # No notifications for snapshots that were never written
+            return
+        
+        for notification in pending_notifications:
+            try:
+                await self.notify_followers(**notification)
+            except Exception as e:
+                logger.error(f"Error notifying followers of topic {notification['topic_id']}: {e}")
+    
+    async def run_history_check_cycle(self) -> Dict[str, Any]:
+        # One timestamp for the whole cycle: every page's pre-filter and scores use the same clock
+        cycle_now = utcnow()
+        logger.info(f"Topic History Check Cycle Started at {cycle_now.strftime('%H:%M:%S UTC')}")
+        await self._ensure_indexes()
+        
+        stats = {
+            "topics_checked": 0, "histories_created": 0, "by_type": {}, 
+            "regenerations": 0, "start_time": cycle_now, "errors": 0,
+            "topics_prefiltered": 0
+        }
+        
+        try:
+            # Keyset pagination on _id: each batch is a short indexed range query,
+            # so no cursor stays open (and times out) while a slow batch is processed.
+            # Each page joins every topic with its latest history point server-side
+            # and only returns the topics that can still be significant.
+            last_id = None
+            while True:
+                query = {"status": "active", "has_title": True}
+                if last_id is not None:
+                    query["_id"] = {"$gt": last_id}
+                
+                # Pin the plan to the cycle index once it is known to exist, so a
+                # stats-driven plan change can't turn a page into a collection scan
+                hint = {"hint": CYCLE_INDEX} if self._cycle_index_ready else {}
+                cursor = await self.topics_collection.aggregate(
+                    history_cycle_pipeline(query, self.config.CYCLE_BATCH_SIZE, self.config, cycle_now),
+                    **hint
+                )
+                page = (await cursor.to_list(1))[0]
+                if not page["page"]:
+                    break
+                
+                last_id = page["page"][0]["last_id"]
+                batch_topics = page["candidates"]
+                stats["topics_prefiltered"] += page["page"][0]["scanned"] - len(batch_topics)
+                if batch_topics:
+                    await self._process_history_batch(batch_topics, stats, cycle_now)
             
         except Exception as e:
             logger.error(f"Error in history check cycle: {e}")
             stats["errors"] += 1
         
-        stats["end_time"] = datetime.utcnow()
+        stats["end_time"] = utcnow()
         stats["duration_seconds"] = (stats["end_time"] - stats["start_time"]).total_seconds()
         
-        logger.info(f"Summary: {stats['topics_checked']} checked, {stats['histories_created']} histories created.")
+        logger.info(f"Summary: {stats['topics_checked']} checked ({stats['topics_prefiltered']} pre-filtered), {stats['histories_created']} histories created.")
         return stats
     
+    async def migrate_centroid_encoding(self, batch_size: int = 500) -> int:
+        """
+        Rewrite centroids still stored as float arrays (topics and history) into packed float16.
+        Only the encoding changes: the values are kept as they are, never normalized.
+        """
+        migrated = 0
+        for collection in (self.topics_collection, self.history_collection):
+            while True:
+                docs = await collection.find(
+                    {"centroid_embedding": {"$type": "array"}},
+                    projection={"centroid_embedding": 1}
+                ).limit(batch_size).to_list(batch_size)
+                if not docs:
+                    break
+                
+                await collection.bulk_write([
+                    UpdateOne(
+                        {"_id": doc["_id"]},
+                        {"$set": {"centroid_embedding": encode_embedding(doc["centroid_embedding"])}}
+                    )
+                    for doc in docs
+                ], ordered=False)
+                migrated += len(docs)
+        
+        if migrated:
+            logger.info(f"Re-encoded {migrated} centroids as float16")
+        return migrated
+    
     async def close(self):
-        self.client_db.close()
-        logger.info("MongoDB connection closed")
+        if self._owns_client:
+            await self.client_db.close()
+            logger.info("MongoDB connection closed")
 
 
 async def main():
@@ -1,8 +1,13 @@
 # app/config.py
+import logging
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Production (Render) injects the environment directly, so only parse .env elsewhere
+if os.getenv("ENVIRONMENT") != "production":
+    from dotenv import load_dotenv
+    load_dotenv()
 
 MONGODB_URI = os.getenv("MONGODB_URI")
 MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME")
@@ -12,10 +17,9 @@ if not MONGODB_URI:
 if not MONGODB_DB_NAME:
     raise ValueError("MONGODB_DB_NAME environment variable is not set!")
 
-print(f"MongoDB configured for database: {MONGODB_DB_NAME}")
+logger.debug(f"MongoDB configured for database: {MONGODB_DB_NAME}")
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 FIREBASE_SERVICE_ACCOUNT_KEY = os.getenv("FIREBASE_SERVICE_ACCOUNT_KEY")
 FIREBASE_STORAGE_BUCKET = os.getenv("FIREBASE_STORAGE_BUCKET")
-
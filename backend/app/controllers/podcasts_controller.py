@@ -3,23 +3,31 @@ PodNova Podcast Generation Controller
 Orchestrates podcast generation workflow using service layer
 """
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Awaitable, BinaryIO, Callable, Dict, Optional, List
 from bson import ObjectId
 import asyncio
+import logging
 from enum import Enum
 import traceback
 
+import httpx
+from google.api_core import exceptions as google_exceptions
+from google.genai import errors as genai_errors
+from pymongo.errors import ConnectionFailure
+
 from app.db import db
-from app.services.script_service import ScriptService
-from app.services.audio_service import AudioService
-from app.services.storage_service import StorageService
-from app.services.user_service import UserService
+from app.services.script_service import script_service
+from app.services.audio_service import audio_service
+from app.services.storage_service import storage_service
+from app.services.user_service import user_service
 from app.services.notification_service import notification_service
 from app.monitor import thread_monitor
 
 from fastapi import UploadFile
 from app.services.file_service import file_service
 
+logger = logging.getLogger(__name__)
+
 
 class PodcastStyle(str, Enum):
     """Supported comprehension levels for podcast generation."""
@@ -59,6 +67,9 @@ VOICE_CONFIGS = {
     PodcastVoice.PROFESSIONAL_MALE: "en-US-Chirp3-HD-Charon",
 }
 
+# Stored podcasts hold the voice as a plain string; key the TTS names the same way.
+_VOICE_BY_STR: Dict[str, str] = {voice.value: name for voice, name in VOICE_CONFIGS.items()}
+
 # Mapping from frontend length preferences to minutes.
 PODCAST_LENGTH_MAP = {
     "short": 5,
@@ -74,11 +85,165 @@ TONE_TO_STYLE_MAP = {
     "expert": PodcastStyle.EXPERT
 }
 
-# Singleton service instances.
-script_service = ScriptService()
-audio_service = AudioService()
-storage_service = StorageService()
-user_service = UserService()
+# Statuses a podcast must currently be in for each generation transition to apply.
+_IN_PROGRESS_STATUSES = [
+    PodcastStatus.PENDING,
+    PodcastStatus.GENERATING_SCRIPT,
+    PodcastStatus.GENERATING_AUDIO,
+    PodcastStatus.UPLOADING
+]
+_PREVIOUS_STATUSES = {
+    PodcastStatus.GENERATING_SCRIPT: [PodcastStatus.PENDING],
+    PodcastStatus.GENERATING_AUDIO: [PodcastStatus.GENERATING_SCRIPT],
+    PodcastStatus.UPLOADING: [PodcastStatus.GENERATING_AUDIO],
+    PodcastStatus.COMPLETED: [PodcastStatus.UPLOADING],
+    PodcastStatus.FAILED: _IN_PROGRESS_STATUSES
+}
+
+# Seconds a job may sit in a status before the library sweep fails it. Queued jobs
+# wait on the generation semaphore behind other users' jobs, so they get longer.
+_ZOMBIE_TIMEOUT_SECONDS = 900
+_PENDING_ZOMBIE_TIMEOUT_SECONDS = 3600
+
+# Fields the library list returns; leaves custom_source_text (whole uploaded documents),
+# prompts and bookkeeping on the server. The script stays: the player shows it as the transcript.
+PODCAST_LIST_PROJECTION = {
+    "topic_id": 1, "topic_title": 1, "category": 1, "is_custom": 1, "status": 1,
+    "voice": 1, "style": 1, "length_minutes": 1, "duration_seconds": 1, "audio_url": 1,
+    "transcript_url": 1, "script": 1, "credits_used": 1, "created_at": 1,
+    "completed_at": 1, "error_message": 1
+}
+
+# ESR indexes for the library list: equality on user_id (and status), then the updated_at sort.
+# Library queries only hint them once ensure_podcast_indexes has confirmed they exist.
+PODCAST_LIBRARY_INDEX = [("user_id", 1), ("updated_at", -1)]
+PODCAST_LIBRARY_STATUS_INDEX = [("user_id", 1), ("status", 1), ("updated_at", -1)]
+_library_indexes_ready = False
+
+# Generations run on the server's event loop; this caps how many synthesise and
+# upload at once per worker.
+MAX_CONCURRENT_GENERATIONS = 4
+_generation_semaphore = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
+
+# Strong references to in-flight generation tasks; the loop itself only keeps weak ones.
+_generation_tasks = set()
+
+# External stages (Gemini, TTS, Firebase) get this many tries, backing off 2s then 4s.
+STAGE_RETRY_ATTEMPTS = 3
+STAGE_RETRY_BASE_SECONDS = 2.0
+
+# Failures worth another attempt: dropped connections, timeouts, Mongo failovers and
+# Google APIs answering 429/5xx. Anything else (bad input, missing documents, auth) is final.
+_TRANSIENT_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    ConnectionFailure,
+    httpx.TransportError,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServerError,
+    genai_errors.ServerError
+)
+
+
+async def ensure_podcast_indexes():
+    """Create the podcast library indexes (idempotent; run at startup)."""
+    global _library_indexes_ready
+    try:
+        await db["podcasts"].create_index(PODCAST_LIBRARY_INDEX)
+        await db["podcasts"].create_index(PODCAST_LIBRARY_STATUS_INDEX)
+        _library_indexes_ready = True
+    except Exception as e:
+        print(f"Error creating podcast indexes: {e}")
+
+
+def _start_generation(podcast_id: str, podcast: Optional[Dict] = None):
+    """Schedule background generation for a podcast without blocking the caller."""
+    task = asyncio.create_task(_generate_podcast_async(podcast_id, podcast))
+    _generation_tasks.add(task)
+    task.add_done_callback(_generation_tasks.discard)
+
+
+async def _with_retry(
+    coro_factory: Callable[[], Awaitable],
+    attempts: int = STAGE_RETRY_ATTEMPTS,
+    base: float = STAGE_RETRY_BASE_SECONDS
+):
+    """
+    Await coro_factory(), retrying transient failures with exponential backoff.
+
+    Sleeps base ** attempt seconds between tries and re-raises the last error
+    once every attempt has failed. Non-transient errors are re-raised at once.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return await coro_factory()
+        except Exception as e:
+            if attempt == attempts or not _is_transient(e):
+                raise
+            delay = base ** attempt
+            logger.warning(f"Attempt {attempt}/{attempts} failed: {e}. Retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+
+
+def _is_transient(error: BaseException) -> bool:
+    """Whether an error, or any error it was raised from, is worth retrying."""
+    while error is not None:
+        if isinstance(error, _TRANSIENT_ERRORS):
+            return True
+        if isinstance(error, genai_errors.ClientError) and error.code == 429:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _oid(value: str, label: str = "ID") -> ObjectId:
+    """Parse an id string, rejecting malformed input before any database work."""
+    if not ObjectId.is_valid(value):
+        raise ValueError(f"Invalid {label}")
+    return ObjectId(value)
+
+
+def _isoformat(value):
+    """ISO string for stored datetimes; anything else (legacy strings, None) passes through."""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _serialize_podcast(podcast: Dict, detail: bool = False) -> Dict:
+    """
+    API shape of a podcast document, shared by the library list and the detail view.
+
+    detail adds the owner, generation settings and bookkeeping fields the list omits.
+    Every value is a plain JSON type, so routes can hand the result straight to JSONResponse.
+    """
+    topic_id = podcast.get("topic_id")
+    result = {
+        "id": str(podcast["_id"]),
+        "topic_id": str(topic_id) if topic_id else None,
+        "topic_title": podcast["topic_title"],
+        "category": podcast["category"],
+        "is_custom": podcast.get("is_custom", False),
+        "status": podcast["status"],
+        "voice": podcast["voice"],
+        "style": podcast["style"],
+        "length_minutes": podcast["length_minutes"],
+        "duration_seconds": podcast.get("duration_seconds"),
+        "audio_url": podcast.get("audio_url"),
+        "transcript_url": podcast.get("transcript_url"),
+        "script": podcast.get("script"),
+        "credits_used": podcast.get("credits_used", 0),
+        "created_at": _isoformat(podcast.get("created_at")),
+        "completed_at": _isoformat(podcast.get("completed_at")),
+        "error_message": podcast.get("error_message")
+    }
+    if detail:
+        result.update({
+            "user_id": podcast["user_id"],
+            "custom_prompt": podcast.get("custom_prompt"),
+            "focus_areas": podcast.get("focus_areas", []),
+            "estimated_credits": podcast.get("estimated_credits", 0),
+            "updated_at": _isoformat(podcast.get("updated_at"))
+        })
+    return result
 
 
 async def create_podcast(
@@ -97,7 +262,17 @@ async def create_podcast(
     Inserts a podcast document with status PENDING and launches an async
     generation task.
     """
-    user_profile = await user_service.get_user_profile(user_id)
+    topic_oid = _oid(topic_id, "topic ID")
+    
+    # The profile (for defaults) and the topic (only the fields copied onto the
+    # podcast) are independent reads, so fetch them together.
+    user_profile, topic = await asyncio.gather(
+        user_service.get_user_profile(user_id),
+        db["topics"].find_one({"_id": topic_oid}, {"title": 1, "category": 1})
+    )
+    
+    if not topic:
+        raise ValueError("Topic not found")
     
     if user_profile:
         prefs = user_profile.preferences
@@ -112,19 +287,11 @@ async def create_podcast(
         style = style or PodcastStyle.STANDARD
         length_minutes = length_minutes or 5
     
-    # Validate the topic exists.
-    try:
-        topic = await db["topics"].find_one({"_id": ObjectId(topic_id)})
-    except:
-        raise ValueError("Invalid topic ID")
-    
-    if not topic:
-        raise ValueError("Topic not found")
-    
     # Build the podcast document.
+    now = datetime.utcnow()
     podcast_doc = {
         "user_id": user_id,
-        "topic_id": ObjectId(topic_id),
+        "topic_id": topic_oid,
         "topic_title": topic["title"],
         "category": topic.get("category", "general"),
         "status": PodcastStatus.PENDING,
@@ -135,8 +302,8 @@ async def create_podcast(
         "focus_areas": focus_areas or [],
         "estimated_credits": length_minutes,
         "credits_used": 0,
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
+        "created_at": now,
+        "updated_at": now,
         "script": None,
         "audio_url": None,
         "transcript_url": None,
@@ -148,7 +315,8 @@ async def create_podcast(
     podcast_id = str(result.inserted_id)
     
     # Start background generation without blocking the HTTP response.
-    asyncio.create_task(_generate_podcast_async(podcast_id))
+    # The freshly inserted document is handed over so the task doesn't re-read it.
+    _start_generation(podcast_id, podcast_doc)
     
     return {
         "id": podcast_id,
@@ -193,6 +361,7 @@ async def create_custom_podcast(
          raise ValueError("No valid text could be extracted from files or input.")
             
     # Create the database record for the custom podcast.
+    now = datetime.utcnow()
     podcast_doc = {
         "user_id": user_id,
         "topic_id": None, 
@@ -207,8 +376,8 @@ async def create_custom_podcast(
         "length_minutes": length_minutes,
         "estimated_credits": length_minutes,
         "credits_used": 0,
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
+        "created_at": now,
+        "updated_at": now,
         "script": None,
         "audio_url": None,
         "transcript_url": None,
@@ -219,7 +388,7 @@ async def create_custom_podcast(
     result = await db["podcasts"].insert_one(podcast_doc)
     podcast_id = str(result.inserted_id)
     
-    asyncio.create_task(_generate_podcast_async(podcast_id))
+    _start_generation(podcast_id, podcast_doc)
     
     return {
         "id": podcast_id,
@@ -229,63 +398,84 @@ async def create_custom_podcast(
     }
 
 
-async def _generate_podcast_async(podcast_id: str):
+async def _generate_podcast_async(podcast_id: str, podcast: Optional[Dict] = None):
     """
     Asynchronous background task that generates the podcast script, synthesises
     audio, uploads the result, and sends a push notification.
+
+    Callers that have just written the podcast document pass it in to skip
+    the initial read. Waits for a slot when MAX_CONCURRENT_GENERATIONS are running.
     """
+    async with _generation_semaphore:
+        await _generate_podcast(podcast_id, podcast)
+
+
+async def _generate_podcast(podcast_id: str, podcast: Optional[Dict]):
+    """Body of _generate_podcast_async, run while holding a generation slot."""
     thread_monitor.start_task()
     try:
-        podcast = await db["podcasts"].find_one({"_id": ObjectId(podcast_id)})
+        if podcast is None:
+            podcast = await db["podcasts"].find_one({"_id": _oid(podcast_id)})
         if not podcast:
             print(f"Podcast {podcast_id} not found in DB. Aborting.")
             return
 
-        await _update_podcast_status(podcast_id, PodcastStatus.GENERATING_SCRIPT)
+        if not await _update_podcast_status(podcast_id, PodcastStatus.GENERATING_SCRIPT):
+            print(f"Podcast {podcast_id} changed state before generation started. Aborting.")
+            return
         
         # Generate script either from a topic or from custom source text.
         if podcast.get("is_custom"):
-            script = await script_service.generate_custom_script(podcast_id)
+            script = await _with_retry(lambda: script_service.generate_custom_script(podcast_id))
         else:
-            script = await script_service.generate_script(podcast_id)  
+            script = await _with_retry(lambda: script_service.generate_script(podcast_id))
                   
-        await _update_podcast_status(
+        if not await _update_podcast_status(
             podcast_id, 
             PodcastStatus.GENERATING_AUDIO,
             {"script": script}
-        )
+        ):
+            print(f"Podcast {podcast_id} was superseded during script generation. Aborting.")
+            return
         
-        audio_data, duration = await _generate_audio_for_podcast(podcast_id, script)
+        audio_file, duration = await _with_retry(lambda: _generate_audio_for_podcast(podcast, script))
         
-        await _update_podcast_status(
-            podcast_id,
-            PodcastStatus.UPLOADING,
-            {"duration_seconds": duration}
-        )
-        
-        audio_url, transcript_url = await storage_service.upload_podcast_files(
-            podcast_id,
-            audio_data,
-            script
-        )
+        try:
+            if not await _update_podcast_status(
+                podcast_id,
+                PodcastStatus.UPLOADING,
+                {"duration_seconds": duration}
+            ):
+                print(f"Podcast {podcast_id} was superseded during audio generation. Aborting.")
+                return
+            
+            audio_url, transcript_url = await _with_retry(
+                lambda: storage_service.upload_podcast_files(podcast_id, audio_file, script)
+            )
+        finally:
+            audio_file.close()
         
         credits_used = max(1, int(duration / 60))
         
-        await _update_podcast_status(
+        if not await _update_podcast_status(
             podcast_id,
             PodcastStatus.COMPLETED,
             {
                 "audio_url": audio_url,
                 "transcript_url": transcript_url,
-                "credits_used": credits_used,
-                "completed_at": datetime.utcnow()
+                "credits_used": credits_used
             }
-        )
+        ):
+            print(f"Podcast {podcast_id} was superseded during upload. Skipping notification.")
+            return
         
         # Send push notification; notification failures are non‑fatal.
         try:
             print(f"Attempting to trigger podcast notification for {podcast_id}")
-            final_podcast = await db["podcasts"].find_one({"_id": ObjectId(podcast_id)})
+            # Re-read only to skip podcasts deleted mid-generation
+            final_podcast = await db["podcasts"].find_one(
+                {"_id": _oid(podcast_id)}, {"topic_title": 1, "user_id": 1}
+            )
             if final_podcast:
                 topic_title = str(final_podcast.get("topic_title", "Recent News"))
                 user_id_str = str(final_podcast.get("user_id"))
@@ -315,25 +505,37 @@ async def _update_podcast_status(
     podcast_id: str,
     status: PodcastStatus,
     additional_fields: Optional[Dict] = None
-):
-    """Update the status and optionally additional fields of a podcast."""
-    update_fields = {
-        "status": status,
-        "updated_at": datetime.utcnow()
-    }
+) -> bool:
+    """
+    Move a podcast to a new status, optionally setting additional fields.
+
+    The write only applies while the podcast is still in a status that may
+    precede the new one, so a job that was failed as a zombie, regenerated or
+    deleted in the meantime is left alone. Returns whether it applied.
+    """
+    update_fields = {"status": status}
     if additional_fields:
         update_fields.update(additional_fields)
     
-    await db["podcasts"].update_one(
-        {"_id": ObjectId(podcast_id)},
-        {"$set": update_fields}
+    # Server-side timestamps, stamped together in the same write
+    current_date = {"updated_at": True}
+    if status == PodcastStatus.COMPLETED:
+        current_date["completed_at"] = True
+    
+    query = {"_id": _oid(podcast_id)}
+    if status in _PREVIOUS_STATUSES:
+        query["status"] = {"$in": _PREVIOUS_STATUSES[status]}
+    
+    result = await db["podcasts"].update_one(
+        query,
+        {"$set": update_fields, "$currentDate": current_date}
     )
+    return result.matched_count > 0
 
 
-async def _generate_audio_for_podcast(podcast_id: str, script: str) -> tuple[bytes, int]:
-    """Retrieve the podcast record, map voice, and call the audio service."""
-    podcast = await db["podcasts"].find_one({"_id": ObjectId(podcast_id)})
-    voice_name = VOICE_CONFIGS[podcast["voice"]]
+async def _generate_audio_for_podcast(podcast: Dict, script: str) -> tuple[BinaryIO, int]:
+    """Map the podcast's voice and the owner's speaking rate, and call the audio service."""
+    voice_name = _VOICE_BY_STR[podcast["voice"]]
     
     user_profile = await user_service.get_user_profile(podcast["user_id"])
     
@@ -354,27 +556,23 @@ async def get_user_podcasts(
     """
     Get all podcasts for a user, automatically failing zombie jobs.
 
-    Any podcast stuck in an in‑progress state for more than 15 minutes is
-    marked as FAILED. Returns formatted podcast objects with a flag indicating
+    Any podcast stuck in an in‑progress state for more than 15 minutes (an
+    hour while still queued as PENDING) is marked as FAILED. Returns formatted podcast objects with a flag indicating
     whether the topic has newer history points (for regeneration hint).
     """
     query = {"user_id": user_id}
     if status:
         query["status"] = status
     
-    fifteen_mins_ago = datetime.utcnow().timestamp() - 900
+    now_ts = datetime.utcnow().timestamp()
     zombie_query = {
         "user_id": user_id,
-        "status": {
-            "$in": [PodcastStatus.PENDING, 
-                    PodcastStatus.GENERATING_SCRIPT, 
-                    PodcastStatus.GENERATING_AUDIO, 
-                    PodcastStatus.UPLOADING]
-                },
+        "status": {"$in": _IN_PROGRESS_STATUSES},
     }
     
-    # Identify and fail zombie jobs.
-    zombies = db["podcasts"].find(zombie_query)
+    # Identify zombie jobs, then fail them all in one write.
+    zombie_ids = []
+    zombies = db["podcasts"].find(zombie_query, {"updated_at": 1, "status": 1})
     async for zombie in zombies:
         zombie_time = zombie.get("updated_at")
         if zombie_time:
@@ -385,14 +583,25 @@ async def get_user_podcasts(
             else:
                 continue
                 
-            if z_ts < fifteen_mins_ago:
-                await db["podcasts"].update_one(
-                    {"_id": zombie["_id"]},
-                    {"$set": {"status": PodcastStatus.FAILED, "error_message": "Generation timed out."}}
-                )
+            if zombie.get("status") == PodcastStatus.PENDING:
+                timeout = _PENDING_ZOMBIE_TIMEOUT_SECONDS
+            else:
+                timeout = _ZOMBIE_TIMEOUT_SECONDS
+            if z_ts < now_ts - timeout:
+                zombie_ids.append(zombie["_id"])
+    
+    if zombie_ids:
+        # The status filter leaves alone any job that moved on since it was read
+        await db["podcasts"].update_many(
+            {"_id": {"$in": zombie_ids}, "status": {"$in": _IN_PROGRESS_STATUSES}},
+            {"$set": {"status": PodcastStatus.FAILED, "error_message": "Generation timed out."}}
+        )
 
     podcasts = []
-    cursor = db["podcasts"].find(query).sort([("updated_at", -1)]).skip(skip).limit(limit)
+    cursor = db["podcasts"].find(query, PODCAST_LIST_PROJECTION).sort([("updated_at", -1)]).skip(skip).limit(limit)
+    if _library_indexes_ready:
+        # Pin the index range scan so a long history never falls back to an in-memory sort
+        cursor = cursor.hint(PODCAST_LIBRARY_STATUS_INDEX if status else PODCAST_LIBRARY_INDEX)
     async for podcast in cursor:
         has_update = False
         # For non‑custom podcasts, check if the topic has a newer history point.
@@ -415,64 +624,25 @@ async def get_user_podcasts(
                 if topic_time > compare_time:
                     has_update = True
 
-        podcasts.append({
-            "id": str(podcast["_id"]),
-            "topic_id": str(podcast["topic_id"]) if podcast.get("topic_id") else None,
-            "topic_title": podcast["topic_title"],
-            "category": podcast["category"],
-            "is_custom": podcast.get("is_custom", False),
-            "status": podcast["status"],
-            "voice": podcast["voice"],
-            "style": podcast["style"],
-            "length_minutes": podcast["length_minutes"],
-            "duration_seconds": podcast.get("duration_seconds"),
-            "audio_url": podcast.get("audio_url"),
-            "transcript_url": podcast.get("transcript_url"),
-            "script": podcast.get("script"),
-            "credits_used": podcast.get("credits_used", 0),
-            "created_at": podcast["created_at"].isoformat() if isinstance(podcast.get("created_at"), datetime) else podcast.get("created_at"),
-            "completed_at": podcast.get("completed_at").isoformat() if isinstance(podcast.get("completed_at"), datetime) else podcast.get("completed_at"),
-            "error_message": podcast.get("error_message"),
-            "has_topic_update": has_update
-        })
+        item = _serialize_podcast(podcast)
+        item["has_topic_update"] = has_update
+        podcasts.append(item)
     
     return podcasts
 
 
 async def get_podcast_by_id(podcast_id: str) -> Optional[Dict]:
     """Get full details of a single podcast, including script and URLs."""
-    try:
-        podcast = await db["podcasts"].find_one({"_id": ObjectId(podcast_id)})
-    except:
+    if not ObjectId.is_valid(podcast_id):
         return None
+    oid = ObjectId(podcast_id)
+    
+    podcast = await db["podcasts"].find_one({"_id": oid})
     
     if not podcast:
         return None
     
-    return {
-        "id": str(podcast["_id"]),
-        "user_id": podcast["user_id"],
-        "topic_id": str(podcast["topic_id"]) if podcast.get("topic_id") else None,
-        "topic_title": podcast["topic_title"],
-        "category": podcast["category"],
-        "is_custom": podcast.get("is_custom", False),
-        "status": podcast["status"],
-        "voice": podcast["voice"],
-        "style": podcast["style"],
-        "length_minutes": podcast["length_minutes"],
-        "custom_prompt": podcast.get("custom_prompt"),
-        "focus_areas": podcast.get("focus_areas", []),
-        "script": podcast.get("script"),
-        "duration_seconds": podcast.get("duration_seconds"),
-        "audio_url": podcast.get("audio_url"),
-        "transcript_url": podcast.get("transcript_url"),
-        "estimated_credits": podcast.get("estimated_credits", 0),
-        "credits_used": podcast.get("credits_used", 0),
-        "created_at": podcast["created_at"].isoformat() if isinstance(podcast.get("created_at"), datetime) else podcast.get("created_at"),
-        "updated_at": podcast["updated_at"].isoformat() if isinstance(podcast.get("updated_at"), datetime) else podcast.get("updated_at"),
-        "completed_at": podcast.get("completed_at").isoformat() if isinstance(podcast.get("completed_at"), datetime) else podcast.get("completed_at"),
-        "error_message": podcast.get("error_message")
-    }
+    return _serialize_podcast(podcast, detail=True)
 
 
 async def regenerate_podcast(
@@ -490,14 +660,14 @@ async def regenerate_podcast(
     Clears previous audio and transcript files, resets generation state,
     and launches a new background generation task.
     """
-    podcast = await db["podcasts"].find_one({"_id": ObjectId(podcast_id)})
+    oid = _oid(podcast_id, "podcast ID")
+    podcast = await db["podcasts"].find_one({"_id": oid})
     if not podcast:
         raise ValueError("Podcast not found")
     
     # Delete old storage files if they exist.
     if podcast.get("audio_url"):
         try:
-            from app.services.storage_service import storage_service
             await storage_service.delete_podcast_files(podcast_id)
         except Exception as e:
             print(f"Warning: Failed to delete old storage files during regeneration: {e}")
@@ -529,11 +699,11 @@ async def regenerate_podcast(
     })
     
     await db["podcasts"].update_one(
-        {"_id": ObjectId(podcast_id)},
+        {"_id": oid},
         {"$set": update_fields}
     )
     
-    asyncio.create_task(_generate_podcast_async(podcast_id))
+    _start_generation(podcast_id)
     
     return {
         "id": podcast_id,
@@ -548,8 +718,12 @@ async def delete_podcast(podcast_id: str, user_id: str) -> bool:
 
     Also removes associated audio and transcript files from storage.
     """
+    if not ObjectId.is_valid(podcast_id):
+        return False
+    oid = ObjectId(podcast_id)
+    
     podcast = await db["podcasts"].find_one({
-        "_id": ObjectId(podcast_id),
+        "_id": oid,
         "user_id": user_id
     })
     
@@ -559,6 +733,6 @@ async def delete_podcast(podcast_id: str, user_id: str) -> bool:
     if podcast.get("audio_url"):
         await storage_service.delete_podcast_files(podcast_id)
     
-    await db["podcasts"].delete_one({"_id": ObjectId(podcast_id)})
+    await db["podcasts"].delete_one({"_id": oid})
     
     return True
\ No newline at end of file
@@ -4,13 +4,13 @@ Topics Controller – provides topic listing, detail, history, and search.
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from bson import ObjectId
-from app.db import db
+from app.db import client, db
 from app.ai_pipeline.topic_history import TopicHistoryService
 from app.config import MONGODB_URI, MONGODB_DB_NAME
 import traceback
 
-# Shared history service instance.
-history_service = TopicHistoryService(MONGODB_URI, MONGODB_DB_NAME)
+# Shared history service instance, on the app's connection pool rather than its own.
+history_service = TopicHistoryService(MONGODB_URI, MONGODB_DB_NAME, client=client)
 
 
 async def get_all_categories() -> List[Dict]:
@@ -19,33 +19,36 @@ async def get_all_categories() -> List[Dict]:
     and a trending topic (the most recently updated active topic).
     """
     categories = ["technology", "finance", "politics"]
-    result = []
     
-    for category in categories:
-        topic_count = await db["topics"].count_documents({
-            "category": category,
+    # One pass over the active titled topics: count per category, and the title of
+    # the most recently updated one, instead of two queries per category.
+    pipeline = [
+        {"$match": {
+            "category": {"$in": categories},
             "status": "active",
             "has_title": True
-        })
-        
-        recent_topic = await db["topics"].find_one(
-            {
-                "category": category,
-                "status": "active",
-                "has_title": True
-            },
-            sort=[("last_updated", -1)]
-        )
-        
-        trending = None
-        if recent_topic and recent_topic.get("title"):
-            trending = recent_topic["title"]
-        
+        }},
+        {"$project": {"category": 1, "title": 1, "last_updated": 1}},
+        {"$sort": {"last_updated": -1}},
+        {"$group": {
+            "_id": "$category",
+            "topic_count": {"$sum": 1},
+            "trending": {"$first": "$title"}
+        }}
+    ]
+    
+    stats = {}
+    async for row in await db["topics"].aggregate(pipeline):
+        stats[row["_id"]] = row
+    
+    result = []
+    for category in categories:
+        row = stats.get(category, {})
         result.append({
             "name": category,
             "display_name": category.capitalize(),
-            "topic_count": topic_count,
-            "trending": trending
+            "topic_count": row.get("topic_count", 0),
+            "trending": row.get("trending") or None
         })
     
     return result
@@ -117,16 +120,13 @@ async def get_topic_by_id(topic_id: str) -> Optional[Dict]:
     Get full topic details including associated articles, tags,
     and history timeline.
     """
-    try:
-        if not ObjectId.is_valid(topic_id):
-            print(f"Invalid Topic ID passed to backend: {topic_id}")
-            return None
-            
-        topic = await db["topics"].find_one({"_id": ObjectId(topic_id)})
-    except Exception as e:
-        print(f"Database error fetching topic: {e}")
+    if not ObjectId.is_valid(topic_id):
+        print(f"Invalid Topic ID passed to backend: {topic_id}")
         return None
     
+    # Database errors propagate rather than masquerading as a missing topic
+    topic = await db["topics"].find_one({"_id": ObjectId(topic_id)})
+    
     if not topic:
         return None
     
@@ -350,7 +350,7 @@ async def search_topics(query: str, category: Optional[str] = None, limit: int =
             }
         })
         
-        cursor = db["topics"].aggregate(pipeline)
+        cursor = await db["topics"].aggregate(pipeline)
         
         topics = []
         async for item in cursor:
@@ -8,9 +8,7 @@ from bson import ObjectId
 from app.db import db
 from app.models.user import UserProfile, UserPreferences
 from app.middleware import firebase_auth
-from app.services.storage_service import StorageService
-
-storage_service = StorageService()
+from app.services.storage_service import storage_service
 
 
 async def create_user_profile(firebase_user: dict) -> UserProfile:
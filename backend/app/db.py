@@ -1,9 +1,18 @@
 # app/db.py
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient
 from app.config import MONGODB_URI, MONGODB_DB_NAME
 
 # Simple connection - no SSL workarounds needed!
-client = AsyncIOMotorClient(MONGODB_URI)
+# Native async PyMongo: no executor hop per operation as with Motor
+# One pool per worker process, shared by every controller and service: a few warm
+# connections, a bounded ceiling, and a bounded wait instead of queueing forever
+client = AsyncMongoClient(
+    MONGODB_URI,
+    maxPoolSize=50,
+    minPoolSize=5,
+    maxIdleTimeMS=60000,
+    waitQueueTimeoutMS=5000
+)
 db = client[MONGODB_DB_NAME]
 
 print("MongoDB client initialised")
\ No newline at end of file
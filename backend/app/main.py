@@ -43,13 +43,17 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup_event():
-    """Test MongoDB connection on startup"""
+    """Test MongoDB connection and ensure request-path indexes on startup"""
     try:
         from app.db import client
         await client.admin.command('ping')
         print("MongoDB connection successful!")
     except Exception as e:
         print(f"MongoDB connection failed: {e}")
+        return
+    
+    from app.controllers.podcasts_controller import ensure_podcast_indexes
+    await ensure_podcast_indexes()
 
 @app.get("/")
 def root():
@@ -7,6 +7,7 @@ from datetime import datetime
 import time
 
 from fastapi import APIRouter, HTTPException, status, Query, Depends, UploadFile, File, Form
+from fastapi.responses import JSONResponse
 from typing import Optional, List
 from pydantic import BaseModel, Field
 from app.middleware.firebase_auth import verify_firebase_token
@@ -155,11 +156,12 @@ async def get_podcast_library(
             skip=skip
         )
         
-        return {
+        # Serialized podcasts are already JSON types: skip FastAPI's jsonable_encoder pass
+        return JSONResponse({
             "podcasts": podcasts,
             "count": len(podcasts),
             "user_id": user_uid
-        }
+        })
         
     except Exception as e:
         print(f"Error fetching library: {str(e)}")
@@ -193,7 +195,7 @@ async def get_podcast_details(
                 detail="Access denied: You don't own this podcast"
             )
         
-        return podcast
+        return JSONResponse(podcast)
         
     except HTTPException:
         raise
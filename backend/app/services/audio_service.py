@@ -8,11 +8,18 @@ import json
 import re
 import asyncio
 import concurrent.futures
-from typing import List, Tuple
+import itertools
+import tempfile
+from collections import deque
+from typing import BinaryIO, List, Tuple
 from google.cloud import texttospeech
 from google.oauth2 import service_account
 
 
+# Finished audio stays in memory up to this size, then spills to a temporary file
+AUDIO_SPOOL_MAX_BYTES = 1024 * 1024
+
+
 class AudioService:
     """Service for generating audio from text using Google Cloud TTS"""
     
@@ -30,7 +37,8 @@ class AudioService:
             self.tts_client = texttospeech.TextToSpeechClient()
         
         # Create thread pool for blocking operations
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self.max_workers = 2
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
     
     def chunk_text(self, text: str, max_chars: int = 4000) -> List[str]:
         """
@@ -79,62 +87,78 @@ class AudioService:
         script: str,
         voice_name: str,
         speaking_rate: float = 1.0
-    ) -> Tuple[bytes, int]:
+    ) -> Tuple[BinaryIO, int]:
         """
         Generate audio from script using Google Cloud TTS (non-blocking)
         
+        Chunks are written to a spooled temporary file as they finish, so a
+        long podcast is never held in memory as one buffer. The caller owns
+        the returned file and should close it once uploaded.
+        
         Args:
             script: The podcast script text
             voice_name: The voice model name
             speaking_rate: Speech speed multiplier (0.8-1.25)
             
         Returns:
-            Tuple of (audio_bytes, duration_seconds)
+            Tuple of (audio_file rewound to the start, duration_seconds)
         """
         chunks = self.chunk_text(script)
-        full_audio = b""
         
         loop = asyncio.get_running_loop()
         
-        for chunk in chunks:
-            # Create synthesis function for this chunk
-            def synthesize_chunk(text_chunk):
-                synthesis_input = texttospeech.SynthesisInput(text=text_chunk)
-                
-                voice = texttospeech.VoiceSelectionParams(
-                    language_code="en-US",
-                    name=voice_name,
-                )
-                
-                audio_config = texttospeech.AudioConfig(
-                    audio_encoding=texttospeech.AudioEncoding.MP3,
-                    speaking_rate=speaking_rate,
-                )
-                
-                response = self.tts_client.synthesize_speech(
-                    input=synthesis_input,
-                    voice=voice,
-                    audio_config=audio_config,
-                )
-                return response.audio_content
+        def synthesize_chunk(text_chunk):
+            synthesis_input = texttospeech.SynthesisInput(text=text_chunk)
             
-            # Run the blocking Google SDK call in a thread pool
-            audio_chunk = await loop.run_in_executor(
-                self.executor, 
-                synthesize_chunk, 
-                chunk
+            voice = texttospeech.VoiceSelectionParams(
+                language_code="en-US",
+                name=voice_name,
             )
-            full_audio += audio_chunk
+            
+            audio_config = texttospeech.AudioConfig(
+                audio_encoding=texttospeech.AudioEncoding.MP3,
+                speaking_rate=speaking_rate,
+            )
+            
+            response = self.tts_client.synthesize_speech(
+                input=synthesis_input,
+                voice=voice,
+                audio_config=audio_config,
+            )
+            return response.audio_content
+        
+        # Keep a small window of chunks in flight so synthesis of the next chunks overlaps
+        # the current one, and write them out in script order. A new chunk is only submitted
+        # once one is on the spool, so at most window finished chunks are ever held in memory.
+        window = self.max_workers + 1
+        remaining = iter(chunks)
+        pending = deque()
+        audio_file = tempfile.SpooledTemporaryFile(max_size=AUDIO_SPOOL_MAX_BYTES)
+        try:
+            for chunk in itertools.islice(remaining, window):
+                pending.append(loop.run_in_executor(self.executor, synthesize_chunk, chunk))
+            while pending:
+                audio_file.write(await pending.popleft())
+                next_chunk = next(remaining, None)
+                if next_chunk is not None:
+                    pending.append(loop.run_in_executor(self.executor, synthesize_chunk, next_chunk))
+        except BaseException:
+            audio_file.close()
+            for future in pending:
+                future.cancel()
+            raise
+        audio_file.seek(0)
         
         # Estimate duration based on word count
         word_count = len(script.split())
         # Average speaking rate: ~150 words per minute, adjust for speaking_rate
         duration_seconds = int((word_count / 150) * 60 / speaking_rate)
         
-        return full_audio, duration_seconds
+        return audio_file, duration_seconds
     
     async def cleanup(self):
         """Clean up thread pool"""
         self.executor.shutdown(wait=True)
 
-
+# Initialize a singleton instance to be imported by controllers
+audio_service = AudioService()
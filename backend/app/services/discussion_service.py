@@ -26,6 +26,7 @@ class DiscussionService:
             if existing:
                 return str(existing["_id"])
             
+            now = datetime.utcnow()
             discussion_data = {
                 "title": topic_title,
                 "description": f"{topic_summary}",
@@ -40,8 +41,8 @@ class DiscussionService:
                 "view_count": 0,
                 "unique_view_count": 0,
                 "viewed_by": [],
-                "created_at": datetime.utcnow(),
-                "last_activity": datetime.utcnow(),
+                "created_at": now,
+                "last_activity": now,
                 "is_active": True,
                 "is_pinned": False,
                 "is_auto_created": True
@@ -56,6 +57,7 @@ class DiscussionService:
     async def create_community_discussion(self, title: str, description: str, user_id: str, username: str, tags: List[str] = None, category: Optional[str] = None) -> Discussion:
         """Create a user-created community discussion"""
         try:
+            now = datetime.utcnow()
             discussion_data = {
                 "title": title,
                 "description": description,
@@ -70,8 +72,8 @@ class DiscussionService:
                 "view_count": 0,
                 "unique_view_count": 0,
                 "viewed_by": [],
-                "created_at": datetime.utcnow(),
-                "last_activity": datetime.utcnow(),
+                "created_at": now,
+                "last_activity": now,
                 "is_active": True,
                 "is_pinned": False,
                 "is_auto_created": False
@@ -125,7 +127,7 @@ class DiscussionService:
                 pipeline.append({"$skip": skip})
                 pipeline.append({"$limit": limit})
                 
-                cursor = db["discussions"].aggregate(pipeline)
+                cursor = await db["discussions"].aggregate(pipeline)
                 return await self._process_cursor(cursor, user_id)
 
             # --- SCENARIO B: FEED MODE ---
@@ -275,21 +277,18 @@ class DiscussionService:
 
     async def delete_discussion(self, discussion_id: str, user_id: str) -> bool:
         """Soft delete a discussion (Requires ownership)"""
-        try:
-            if not ObjectId.is_valid(discussion_id): return False
-            
-            disc = await db["discussions"].find_one({"_id": ObjectId(discussion_id)})
-            if not disc or disc.get("user_id") != user_id: 
-                return False
-                
-            # Soft delete to preserve DB integrity for child replies
-            result = await db["discussions"].update_one(
-                {"_id": ObjectId(discussion_id)},
-                {"$set": {"is_active": False}}
-            )
-            return result.modified_count > 0
-        except Exception:
+        if not ObjectId.is_valid(discussion_id): return False
+        
+        disc = await db["discussions"].find_one({"_id": ObjectId(discussion_id)})
+        if not disc or disc.get("user_id") != user_id: 
             return False
+            
+        # Soft delete to preserve DB integrity for child replies
+        result = await db["discussions"].update_one(
+            {"_id": ObjectId(discussion_id)},
+            {"$set": {"is_active": False}}
+        )
+        return result.modified_count > 0
 
     async def create_reply(self, discussion_id: str, content: str, user_id: str, username: str, parent_reply_id: Optional[str] = None) -> Reply:
         """Create a reply to a discussion"""
@@ -352,23 +351,21 @@ class DiscussionService:
 
     async def delete_reply(self, reply_id: str, user_id: str) -> bool:
         """Delete a reply (soft delete)"""
-        try:
-            if not ObjectId.is_valid(reply_id): return False
-            reply = await db["replies"].find_one({"_id": ObjectId(reply_id)})
-            if not reply or reply["user_id"] != user_id: return False
-            
-            result = await db["replies"].update_one({"_id": ObjectId(reply_id)}, {
-                "$set": {
-                    "is_deleted": True,
-                    "content": "[deleted]",
-                    "updated_at": datetime.utcnow()
-                }
-            })
-            if result.modified_count > 0:
-                await db["discussions"].update_one({"_id": ObjectId(reply["discussion_id"])}, {"$inc": {"reply_count": -1}})
-                return True
-            return False
-        except Exception: return False
+        if not ObjectId.is_valid(reply_id): return False
+        reply = await db["replies"].find_one({"_id": ObjectId(reply_id)})
+        if not reply or reply["user_id"] != user_id: return False
+        
+        result = await db["replies"].update_one({"_id": ObjectId(reply_id)}, {
+            "$set": {
+                "is_deleted": True,
+                "content": "[deleted]",
+                "updated_at": datetime.utcnow()
+            }
+        })
+        if result.modified_count > 0:
+            await db["discussions"].update_one({"_id": ObjectId(reply["discussion_id"])}, {"$inc": {"reply_count": -1}})
+            return True
+        return False
 
     async def get_replies(self, discussion_id: str, user_id: Optional[str] = None) -> List[Dict]:
         """Get all replies for a discussion"""
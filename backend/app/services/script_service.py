@@ -123,7 +123,7 @@ CRITICAL INCLUSIVITY & VOCABULARY RULES:
             return self._sanitize_for_tts(script)
             
         except Exception as e:
-            raise Exception(f"Failed to generate script: {str(e)}")
+            raise Exception(f"Failed to generate script: {str(e)}") from e
 
     async def generate_custom_script(self, podcast_id: str) -> str:
         """Generate a script entirely from user-uploaded documents and prompts"""
@@ -147,7 +147,7 @@ CRITICAL INCLUSIVITY & VOCABULARY RULES:
             return self._sanitize_for_tts(script)
             
         except Exception as e:
-            raise Exception(f"Failed to generate custom script: {str(e)}")
+            raise Exception(f"Failed to generate custom script: {str(e)}") from e
             
     def _sanitize_for_tts(self, text: str) -> str:
         """Deterministic post-processing to strip Markdown and TTS-breaking characters."""
@@ -394,4 +394,7 @@ CONSISTENT INTRO & OUTRO PATTERN:
 
 Now, generate the podcast script. Write ONLY the spoken words.
 """
-        return prompt
\ No newline at end of file
+        return prompt
+
+# Initialize a singleton instance to be imported by controllers
+script_service = ScriptService()
@@ -4,9 +4,14 @@ Storage service for managing Firebase Storage uploads
 Handles podcast audio and transcript file uploads
 """
 from firebase_admin import storage
-from typing import Tuple
+from typing import BinaryIO, Tuple, Union
+import asyncio
 import time
 
+# Files are sent with a resumable upload in pieces of this size (a multiple of 256 KB)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
 class StorageService:
     """Service for managing file uploads to Firebase Storage"""
     
@@ -23,36 +28,48 @@ class StorageService:
     async def upload_podcast_files(
         self,
         podcast_id: str,
-        audio_data: bytes,
+        audio_file: BinaryIO,
         script: str
     ) -> Tuple[str, str]:
         """
         Upload podcast audio and transcript to Firebase Storage
         Appends a timestamp to bypass frontend caching on regeneration.
+        The audio is streamed from audio_file in chunks rather than read into memory.
         """
         # Create a unique timestamp for this generation
         timestamp = int(time.time())
         
-        # Upload audio with timestamped name
-        audio_blob = self.bucket.blob(f"podcasts/{podcast_id}/audio_{timestamp}.mp3")
-        audio_blob.upload_from_string(
-            audio_data,
-            content_type="audio/mpeg"
+        # Both uploads are blocking SDK calls: run them side by side off the event loop
+        audio_url, transcript_url = await asyncio.gather(
+            asyncio.to_thread(
+                self._upload_public,
+                f"podcasts/{podcast_id}/audio_{timestamp}.mp3",
+                audio_file,
+                "audio/mpeg"
+            ),
+            asyncio.to_thread(
+                self._upload_public,
+                f"podcasts/{podcast_id}/transcript_{timestamp}.txt",
+                script,
+                "text/plain"
+            )
         )
-        audio_blob.make_public()
-        audio_url = audio_blob.public_url
-        
-        # Upload transcript with timestamped name
-        transcript_blob = self.bucket.blob(f"podcasts/{podcast_id}/transcript_{timestamp}.txt")
-        transcript_blob.upload_from_string(
-            script,
-            content_type="text/plain"
-        )
-        transcript_blob.make_public()
-        transcript_url = transcript_blob.public_url
         
         return audio_url, transcript_url
     
+    def _upload_public(self, path: str, data: Union[bytes, str, BinaryIO], content_type: str) -> str:
+        """Upload one file, make it public and return its URL (blocking)"""
+        if isinstance(data, (bytes, str)):
+            blob = self.bucket.blob(path)
+            blob.upload_from_string(data, content_type=content_type)
+        else:
+            # Rewind so a retried upload sends the whole file again
+            data.seek(0)
+            blob = self.bucket.blob(path, chunk_size=UPLOAD_CHUNK_SIZE)
+            blob.upload_from_file(data, content_type=content_type)
+        blob.make_public()
+        return blob.public_url
+    
     async def delete_podcast_files(self, podcast_id: str) -> bool:
         """
         Delete all podcast files from Firebase Storage for a specific ID.
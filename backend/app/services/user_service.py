@@ -78,4 +78,6 @@ class UserService:
         except Exception as e:
             print(f"Error fetching user profile: {str(e)}")
             return None
-    
+
+# Initialize a singleton instance to be imported by controllers
+user_service = UserService()